@@ -0,0 +1,226 @@
+"""Async API clients for overlapping independent fetches with asyncio."""
+import asyncio
+import time
+import aiohttp
+from typing import Optional, List, Dict
+from config import Config
+from cache import get_shared_cache
+from logger import setup_logger
+from api_clients.news_api import _from_date_string, _mock_news
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to stdlib
+    import json
+    _loads = json.loads
+
+logger = setup_logger(__name__)
+
+
+class AsyncFootballAPIClient:
+    """Async client for football-data.org API.
+
+    One aiohttp session is kept alive per client so a prediction
+    request can gather fixtures, team stats and H2H concurrently
+    instead of paying each round trip in sequence.
+    """
+
+    def __init__(self, api_key: str = None):
+        """Initialize client."""
+        self.api_key = api_key or Config.FOOTBALL_API_KEY
+        self.base_url = Config.FOOTBALL_API_BASE_URL
+        self.headers = {"X-Auth-Token": self.api_key}
+        self.cache = get_shared_cache()
+        self.timeout = aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it lazily."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers, timeout=self.timeout
+            )
+        return self._session
+
+    async def close(self):
+        """Close the underlying session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        """Make API request with error handling."""
+        url = f"{self.base_url}{endpoint}"
+        try:
+            async with self._get_session().get(url, params=params) as response:
+                response.raise_for_status()
+                raw = await response.read()
+                return _loads(raw)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Async API request failed: {e}")
+            return None
+
+    async def get_upcoming_matches(self, league_id: int,
+                                   days: int = 7) -> Optional[List[Dict]]:
+        """Get upcoming matches for a league."""
+        cache_key = f"upcoming_matches_{league_id}_{days}"
+        cached = self.cache.get_cache(cache_key)
+        if cached:
+            return cached
+
+        try:
+            from api_clients.football_api import _date_range_strings
+            date_from, date_to = _date_range_strings(int(time.time()) // 60, days)
+
+            data = await self._make_request(
+                f"/competitions/{league_id}/matches",
+                params={
+                    "status": "SCHEDULED",
+                    "dateFrom": date_from,
+                    "dateTo": date_to
+                }
+            )
+
+            if data and "matches" in data:
+                matches = []
+                for match in data["matches"]:
+                    matches.append({
+                        "id": match.get("id"),
+                        "external_id": match.get("id"),
+                        "home_team": match.get("homeTeam", {}).get("name"),
+                        "home_team_id": match.get("homeTeam", {}).get("id"),
+                        "away_team": match.get("awayTeam", {}).get("name"),
+                        "away_team_id": match.get("awayTeam", {}).get("id"),
+                        "date": match.get("utcDate"),
+                        "status": match.get("status"),
+                        "odds": match.get("odds", {})
+                    })
+                self.cache.set_cache(cache_key, matches, Config.CACHE_TTL_FIXTURES)
+                return matches
+        except Exception as e:
+            logger.error(f"Failed to get upcoming matches: {e}")
+        return None
+
+    async def get_team_stats(self, team_id: int) -> Optional[Dict]:
+        """Get team statistics."""
+        cache_key = f"team_stats_{team_id}"
+        cached = self.cache.get_cache(cache_key)
+        if cached:
+            return cached
+
+        try:
+            data = await self._make_request(f"/teams/{team_id}")
+            if data:
+                stats = {
+                    "id": data.get("id"),
+                    "name": data.get("name"),
+                    "country": data.get("area", {}).get("name"),
+                    "founded": data.get("founded"),
+                    "crest": data.get("crest"),
+                    "venue": data.get("venue"),
+                    "coach": data.get("coach", {}).get("name") if data.get("coach") else None,
+                    "squad": [
+                        {
+                            "id": p.get("id"),
+                            "name": p.get("name"),
+                            "position": p.get("position"),
+                            "nation": p.get("nationality")
+                        }
+                        for p in data.get("squad", [])
+                    ]
+                }
+                self.cache.set_cache(cache_key, stats, Config.CACHE_TTL_SQUAD)
+                return stats
+        except Exception as e:
+            logger.error(f"Failed to get team stats: {e}")
+        return None
+
+    async def get_many_team_stats(self, team_ids: List[int]) -> Dict[int, Dict]:
+        """Fetch stats for several teams concurrently."""
+        if not team_ids:
+            return {}
+        results = await asyncio.gather(
+            *(self.get_team_stats(team_id) for team_id in team_ids)
+        )
+        return dict(zip(team_ids, results))
+
+
+class AsyncNewsAPIClient:
+    """Async client for fetching sports news."""
+
+    def __init__(self, api_key: str = None):
+        """Initialize client."""
+        self.api_key = api_key or Config.NEWS_API_KEY
+        self.base_url = Config.NEWS_API_BASE_URL
+        self.cache = get_shared_cache()
+        self.timeout = aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it lazily."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        return self._session
+
+    async def close(self):
+        """Close the underlying session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def get_team_news(self, team_name: str,
+                            days: int = 7) -> Optional[List[Dict]]:
+        """Get recent news about a team."""
+        cache_key = f"team_news_{team_name}_{days}"
+        cached = self.cache.get_cache(cache_key)
+        if cached:
+            return cached
+
+        try:
+            from_date = _from_date_string(int(time.time()) // 60, days)
+
+            if not self.api_key:
+                logger.warning("NewsAPI key not configured, using mock data")
+                return _mock_news(team_name)
+
+            url = f"{self.base_url}/everything"
+            params = {
+                "q": f"{team_name} football",
+                "sortBy": "publishedAt",
+                "language": "en",
+                "from": from_date,
+                "apiKey": self.api_key,
+                "pageSize": 20
+            }
+
+            async with self._get_session().get(url, params=params) as response:
+                response.raise_for_status()
+                raw = await response.read()
+            data = _loads(raw)
+
+            news = []
+            if data.get("articles"):
+                for article in data["articles"][:20]:
+                    news.append({
+                        "title": article.get("title"),
+                        "description": article.get("description"),
+                        "url": article.get("url"),
+                        "source": article.get("source", {}).get("name"),
+                        "published_at": article.get("publishedAt"),
+                        "content": (article.get("content") or "")[:200]
+                    })
+
+            self.cache.set_cache(cache_key, news, Config.CACHE_TTL_SECONDS)
+            return news
+        except Exception as e:
+            logger.error(f"Failed to get team news: {e}")
+            return _mock_news(team_name)
+
+    async def get_many_team_news(self, team_names: List[str],
+                                 days: int = 7) -> Dict[str, List[Dict]]:
+        """Fetch news for several teams concurrently."""
+        if not team_names:
+            return {}
+        results = await asyncio.gather(
+            *(self.get_team_news(name, days) for name in team_names)
+        )
+        return dict(zip(team_names, results))
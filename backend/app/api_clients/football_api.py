@@ -1,14 +1,72 @@
 """Football API client for fetching match and team data."""
+import functools
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter, Retry
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from config import Config
-from cache import Cache
+from cache import get_shared_cache
 from logger import setup_logger
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to stdlib
+    import json
+    _loads = json.loads
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to full-document parse
+    ijson = None
+
 logger = setup_logger(__name__)
 
 
+@functools.lru_cache(maxsize=8)
+def _date_range_strings(minute: int, days: int) -> tuple:
+    """Return (today, today+days) date strings, cached per minute.
+
+    Keyed by the current minute so batch loops over many leagues reuse
+    one strftime result instead of redoing datetime arithmetic per call.
+    """
+    today = datetime.now()
+    return (today.strftime("%Y-%m-%d"),
+            (today + timedelta(days=days)).strftime("%Y-%m-%d"))
+
+
+def _extract_match_fields(match: Dict) -> tuple:
+    """Pull the fields H2H aggregation needs with one lookup each."""
+    home_team = match.get("homeTeam") or {}
+    away_team = match.get("awayTeam") or {}
+    full_time = (match.get("score") or {}).get("fullTime") or {}
+    return (home_team.get("id"), away_team.get("id"),
+            full_time.get("home"), full_time.get("away"),
+            home_team.get("name"), away_team.get("name"),
+            match.get("utcDate"))
+
+
+def _build_session(headers: Dict = None) -> requests.Session:
+    """Build a keep-alive session with retry/backoff for transient errors."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504]
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
 class FootballAPIClient:
     """Client for football-data.org API."""
 
@@ -17,25 +75,83 @@ class FootballAPIClient:
         self.api_key = api_key or Config.FOOTBALL_API_KEY
         self.base_url = Config.FOOTBALL_API_BASE_URL
         self.headers = {"X-Auth-Token": self.api_key}
-        self.cache = Cache()
+        self.session = _build_session(self.headers)
+        self.cache = get_shared_cache()
         self.timeout = Config.REQUEST_TIMEOUT
 
     def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
-        """Make API request with error handling."""
+        """Make API request with conditional GET and error handling.
+
+        ETag / Last-Modified validators are stored alongside the parsed
+        body; when the server answers 304 Not Modified the cached body
+        is reused without downloading or re-parsing anything.
+        """
         url = f"{self.base_url}{endpoint}"
+        validator_key = (f"http_validator_{endpoint}_"
+                         f"{sorted(params.items()) if params else ''}")
+        cached = self.cache.get_cache(validator_key)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("lm"):
+                headers["If-Modified-Since"] = cached["lm"]
+
         try:
-            response = requests.get(
+            response = self.session.get(
                 url,
-                headers=self.headers,
                 params=params,
+                headers=headers or None,
                 timeout=self.timeout
             )
+            if response.status_code == 304 and cached:
+                # Unchanged on the server; refresh the TTL and reuse
+                self.cache.set_cache(validator_key, cached,
+                                     Config.CACHE_TTL_SECONDS)
+                return cached["body"]
             response.raise_for_status()
-            return response.json()
+            data = _loads(response.content)
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self.cache.set_cache(
+                    validator_key,
+                    {"body": data, "etag": etag, "lm": last_modified},
+                    Config.CACHE_TTL_SECONDS
+                )
+            return data
         except requests.exceptions.RequestException as e:
             logger.error(f"API request failed: {e}")
             return None
 
+    def _iter_matches(self, endpoint: str, params: Dict = None):
+        """Stream match objects from a matches endpoint one at a time.
+
+        Competition-wide match lists can run to tens of thousands of
+        entries; streaming avoids building the full document in memory
+        when the caller only keeps a filtered subset.
+        """
+        if ijson is None:
+            data = self._make_request(endpoint, params)
+            if data and "matches" in data:
+                yield from data["matches"]
+            return
+
+        url = f"{self.base_url}{endpoint}"
+        try:
+            response = self.session.get(
+                url,
+                params=params,
+                timeout=self.timeout,
+                stream=True
+            )
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, "matches.item")
+        except (requests.exceptions.RequestException, ijson.JSONError) as e:
+            logger.error(f"API stream request failed: {e}")
+
     def get_upcoming_matches(self, league_id: int, days: int = 7) -> Optional[List[Dict]]:
         """Get upcoming matches for a league."""
         cache_key = f"upcoming_matches_{league_id}_{days}"
@@ -45,15 +161,14 @@ class FootballAPIClient:
 
         try:
             # Calculate date range
-            today = datetime.now()
-            future_date = today + timedelta(days=days)
+            date_from, date_to = _date_range_strings(int(time.time()) // 60, days)
 
             data = self._make_request(
                 f"/competitions/{league_id}/matches",
                 params={
                     "status": "SCHEDULED",
-                    "dateFrom": today.strftime("%Y-%m-%d"),
-                    "dateTo": future_date.strftime("%Y-%m-%d")
+                    "dateFrom": date_from,
+                    "dateTo": date_to
                 }
             )
 
@@ -71,7 +186,7 @@ class FootballAPIClient:
                         "status": match.get("status"),
                         "odds": match.get("odds", {})
                     })
-                self.cache.set_cache(cache_key, matches, Config.CACHE_TTL_SECONDS)
+                self.cache.set_cache(cache_key, matches, Config.CACHE_TTL_FIXTURES)
                 return matches
         except Exception as e:
             logger.error(f"Failed to get upcoming matches: {e}")
@@ -97,7 +212,11 @@ class FootballAPIClient:
                     "away_score": data.get("score", {}).get("fullTime", {}).get("away"),
                     "referees": [r.get("name") for r in data.get("referees", [])]
                 }
-                self.cache.set_cache(cache_key, stats, Config.CACHE_TTL_SECONDS)
+                # Finished matches are immutable; cache them long-term.
+                # In-play or scheduled stats go stale quickly.
+                ttl = (Config.CACHE_TTL_IMMUTABLE if stats["status"] == "FINISHED"
+                       else 300)
+                self.cache.set_cache(cache_key, stats, ttl)
                 return stats
         except Exception as e:
             logger.error(f"Failed to get match stats: {e}")
@@ -131,13 +250,31 @@ class FootballAPIClient:
                         for p in data.get("squad", [])
                     ]
                 }
-                self.cache.set_cache(cache_key, stats, Config.CACHE_TTL_SECONDS)
+                self.cache.set_cache(cache_key, stats, Config.CACHE_TTL_SQUAD)
                 return stats
         except Exception as e:
             logger.error(f"Failed to get team stats: {e}")
         return None
 
-    def get_head_to_head(self, home_team_id: int, away_team_id: int, 
+    def get_many_team_stats(self, team_ids: List[int],
+                            max_workers: int = 8) -> Dict[int, Dict]:
+        """Fetch stats for several teams concurrently."""
+        if not team_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(team_ids))) as executor:
+            results = executor.map(self.get_team_stats, team_ids)
+        return dict(zip(team_ids, results))
+
+    def get_many_h2h(self, pairs: List[tuple],
+                     max_workers: int = 8) -> Dict[tuple, Dict]:
+        """Fetch head-to-head stats for several team pairs concurrently."""
+        if not pairs:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+            results = executor.map(lambda p: self.get_head_to_head(*p), pairs)
+        return dict(zip(pairs, results))
+
+    def get_head_to_head(self, home_team_id: int, away_team_id: int,
                         matches: int = 10) -> Optional[Dict]:
         """Get head-to-head statistics between two teams."""
         cache_key = f"h2h_{home_team_id}_{away_team_id}_{matches}"
@@ -147,56 +284,52 @@ class FootballAPIClient:
 
         try:
             # This endpoint may vary by API provider
-            # Using a generic approach
-            data = self._make_request(
-                f"/matches",
-                params={
-                    "competitions": Config.DEFAULT_LEAGUE_ID
-                }
-            )
+            # Using a generic approach; stream so the full competition
+            # match list is never materialized at once, and extract each
+            # match's fields exactly once
+            pair = {home_team_id, away_team_id}
+            h2h_stats = {
+                "home_wins": 0,
+                "draws": 0,
+                "away_wins": 0,
+                "recent_matches": []
+            }
 
-            if data and "matches" in data:
-                h2h_matches = [
-                    m for m in data["matches"]
-                    if ((m.get("homeTeam", {}).get("id") == home_team_id and 
-                         m.get("awayTeam", {}).get("id") == away_team_id) or
-                        (m.get("homeTeam", {}).get("id") == away_team_id and 
-                         m.get("awayTeam", {}).get("id") == home_team_id))
-                ][:matches]
-
-                h2h_stats = {
-                    "home_wins": 0,
-                    "draws": 0,
-                    "away_wins": 0,
-                    "recent_matches": []
-                }
+            for match in self._iter_matches(
+                "/matches",
+                params={"competitions": Config.DEFAULT_LEAGUE_ID}
+            ):
+                (hid, aid, home_score, away_score,
+                 home_name, away_name, match_date) = _extract_match_fields(match)
+
+                if {hid, aid} != pair:
+                    continue
 
-                for match in h2h_matches:
-                    home_score = match.get("score", {}).get("fullTime", {}).get("home")
-                    away_score = match.get("score", {}).get("fullTime", {}).get("away")
-
-                    if home_score is not None and away_score is not None:
-                        if home_score > away_score:
-                            if match.get("homeTeam", {}).get("id") == home_team_id:
-                                h2h_stats["home_wins"] += 1
-                            else:
-                                h2h_stats["away_wins"] += 1
-                        elif home_score < away_score:
-                            if match.get("homeTeam", {}).get("id") == home_team_id:
-                                h2h_stats["away_wins"] += 1
-                            else:
-                                h2h_stats["home_wins"] += 1
+                if home_score is not None and away_score is not None:
+                    if home_score > away_score:
+                        if hid == home_team_id:
+                            h2h_stats["home_wins"] += 1
                         else:
-                            h2h_stats["draws"] += 1
+                            h2h_stats["away_wins"] += 1
+                    elif home_score < away_score:
+                        if hid == home_team_id:
+                            h2h_stats["away_wins"] += 1
+                        else:
+                            h2h_stats["home_wins"] += 1
+                    else:
+                        h2h_stats["draws"] += 1
 
-                    h2h_stats["recent_matches"].append({
-                        "home_team": match.get("homeTeam", {}).get("name"),
-                        "away_team": match.get("awayTeam", {}).get("name"),
-                        "home_score": home_score,
-                        "away_score": away_score,
-                        "date": match.get("utcDate")
-                    })
+                h2h_stats["recent_matches"].append({
+                    "home_team": home_name,
+                    "away_team": away_name,
+                    "home_score": home_score,
+                    "away_score": away_score,
+                    "date": match_date
+                })
+                if len(h2h_stats["recent_matches"]) >= matches:
+                    break
 
+            if h2h_stats["recent_matches"]:
                 self.cache.set_cache(cache_key, h2h_stats, Config.CACHE_TTL_SECONDS)
                 return h2h_stats
         except Exception as e:
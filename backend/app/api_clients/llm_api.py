@@ -1,14 +1,41 @@
 """LLM API client for explanations and analysis."""
 import requests
-import json
 from typing import Optional, Dict, List, Any
 from config import Config
-from cache import Cache
+from cache import get_shared_cache
 from logger import setup_logger
+from api_clients.football_api import _build_session
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to stdlib
+    import json
+    _loads = json.loads
 
 logger = setup_logger(__name__)
 
 
+def _extract_json(text: str) -> Optional[str]:
+    """Extract the first balanced {...} block from text in one pass.
+
+    Linear-time replacement for re.search(r'{.*}', ..., re.DOTALL),
+    which backtracks over the whole string on long model outputs.
+    """
+    depth = 0
+    start = -1
+    for i, char in enumerate(text):
+        if char == '{':
+            if start < 0:
+                start = i
+            depth += 1
+        elif char == '}' and start >= 0:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
 class LLMAPIClient:
     """Client for LLM-based explanations and analysis."""
 
@@ -17,7 +44,8 @@ class LLMAPIClient:
         self.api_key = api_key or Config.LLM_API_KEY
         self.base_url = base_url or Config.LLM_API_BASE_URL
         self.model = Config.LLM_MODEL
-        self.cache = Cache()
+        self.session = _build_session({"Authorization": f"Bearer {self.api_key}"})
+        self.cache = get_shared_cache()
         self.timeout = Config.REQUEST_TIMEOUT
 
     def generate_explanation(self, match_data: Dict, prediction: Dict) -> str:
@@ -33,9 +61,8 @@ class LLMAPIClient:
 
             prompt = self._build_explanation_prompt(match_data, prediction)
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/chat/completions",
-                headers={"Authorization": f"Bearer {self.api_key}"},
                 json={
                     "model": self.model,
                     "messages": [{"role": "user", "content": prompt}],
@@ -46,8 +73,8 @@ class LLMAPIClient:
             )
 
             response.raise_for_status()
-            data = response.json()
-            
+            data = _loads(response.content)
+
             if data.get("choices") and len(data["choices"]) > 0:
                 explanation = data["choices"][0].get("message", {}).get("content", "")
                 self.cache.set_cache(cache_key, explanation, Config.CACHE_TTL_SECONDS)
@@ -57,6 +84,73 @@ class LLMAPIClient:
         
         return self._get_default_explanation(match_data, prediction)
 
+    def generate_explanations(self, items: List[tuple]) -> List[str]:
+        """Generate explanations for many (match_data, prediction) pairs.
+
+        Coalesces all uncached matches into one chat completion instead
+        of a round-trip per match; answers are split on '---' markers
+        and cached individually.
+        """
+        if not items:
+            return []
+
+        explanations: List[Optional[str]] = [None] * len(items)
+        pending = []
+        for idx, (match_data, prediction) in enumerate(items):
+            cache_key = (f"explanation_{match_data.get('id')}_"
+                         f"{prediction.get('model_type', 'ensemble')}")
+            cached = self.cache.get_cache(cache_key)
+            if cached:
+                explanations[idx] = cached
+            else:
+                pending.append((idx, cache_key, match_data, prediction))
+
+        if pending and self.api_key:
+            try:
+                sections = [
+                    f"MATCH {n}:\n{self._build_explanation_prompt(md, pred)}"
+                    for n, (_, _, md, pred) in enumerate(pending, 1)
+                ]
+                prompt = (
+                    "Answer for each of the following matches in order. "
+                    "Separate the answers with a line containing only \"---\".\n\n"
+                    + "\n\n".join(sections)
+                )
+
+                response = self.session.post(
+                    f"{self.base_url}/chat/completions",
+                    json={
+                        "model": self.model,
+                        "messages": [{"role": "user", "content": prompt}],
+                        "temperature": 0.7,
+                        "max_tokens": 200 * len(pending)
+                    },
+                    timeout=self.timeout
+                )
+
+                response.raise_for_status()
+                data = _loads(response.content)
+
+                if data.get("choices") and len(data["choices"]) > 0:
+                    content = data["choices"][0].get("message", {}).get("content", "")
+                    parts = [part.strip() for part in content.split("---")]
+                    for (idx, cache_key, _, _), part in zip(pending, parts):
+                        if part:
+                            self.cache.set_cache(cache_key, part,
+                                                 Config.CACHE_TTL_SECONDS)
+                            explanations[idx] = part
+            except Exception as e:
+                logger.error(f"Failed to generate batched explanations: {e}")
+
+        # Anything still missing falls back to the static explanation
+        for idx, _, match_data, prediction in pending:
+            if explanations[idx] is None:
+                explanations[idx] = self._get_default_explanation(
+                    match_data, prediction
+                )
+
+        return explanations
+
     def extract_news_insights(self, articles: List[Dict]) -> Dict[str, Any]:
         """Extract structured insights from news articles."""
         if not articles:
@@ -82,9 +176,8 @@ News:
 
 Provide a JSON response with keys: injuries, form, sentiment, key_factors"""
 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/chat/completions",
-                headers={"Authorization": f"Bearer {self.api_key}"},
                 json={
                     "model": self.model,
                     "messages": [{"role": "user", "content": prompt}],
@@ -95,16 +188,15 @@ Provide a JSON response with keys: injuries, form, sentiment, key_factors"""
             )
 
             response.raise_for_status()
-            data = response.json()
-            
+            data = _loads(response.content)
+
             if data.get("choices") and len(data["choices"]) > 0:
                 content = data["choices"][0].get("message", {}).get("content", "")
                 try:
                     # Extract JSON from response
-                    import re
-                    json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                    if json_match:
-                        return json.loads(json_match.group())
+                    json_block = _extract_json(content)
+                    if json_block:
+                        return _loads(json_block)
                 except:
                     pass
 
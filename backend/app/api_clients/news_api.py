@@ -1,13 +1,61 @@
 """News API client for fetching team news."""
+import functools
+import re
+import time
 import requests
+from collections import Counter
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
 from config import Config
-from cache import Cache
+from cache import get_shared_cache
 from logger import setup_logger
+from api_clients.football_api import _build_session
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to stdlib
+    import json
+    _loads = json.loads
 
 logger = setup_logger(__name__)
 
+# Sentiment keyword sets: each article is tokenized once and keywords
+# are counted by hash lookup instead of rescanning the text per keyword
+_POSITIVE_KEYWORDS = frozenset(
+    ["win", "victory", "strong", "excellent", "brilliant", "great"]
+)
+_NEGATIVE_KEYWORDS = frozenset(
+    ["loss", "defeat", "poor", "weak", "injured", "suspension"]
+)
+_TOKEN_RE = re.compile(r"[a-z']+")
+
+
+@functools.lru_cache(maxsize=8)
+def _from_date_string(minute: int, days: int) -> str:
+    """Return the from-date string, cached per minute for batch loops."""
+    return (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _mock_news(team_name: str) -> List[Dict]:
+    """Return mock news data for demonstration."""
+    return [
+        {
+            "title": f"{team_name} secures important victory",
+            "description": f"In a thrilling match, {team_name} defeated their opponents",
+            "source": "Mock Sports News",
+            "published_at": datetime.now().isoformat(),
+            "content": "Mock news content for demonstration purposes"
+        },
+        {
+            "title": f"{team_name} stars shine in recent performance",
+            "description": f"Key players of {team_name} delivered outstanding performances",
+            "source": "Mock Sports News",
+            "published_at": (datetime.now() - timedelta(days=1)).isoformat(),
+            "content": "Mock news content for demonstration purposes"
+        }
+    ]
+
 
 class NewsAPIClient:
     """Client for fetching sports news."""
@@ -16,7 +64,8 @@ class NewsAPIClient:
         """Initialize client."""
         self.api_key = api_key or Config.NEWS_API_KEY
         self.base_url = Config.NEWS_API_BASE_URL
-        self.cache = Cache()
+        self.session = _build_session()
+        self.cache = get_shared_cache()
         self.timeout = Config.REQUEST_TIMEOUT
 
     def get_team_news(self, team_name: str, days: int = 7) -> Optional[List[Dict]]:
@@ -27,7 +76,7 @@ class NewsAPIClient:
             return cached
 
         try:
-            from_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+            from_date = _from_date_string(int(time.time()) // 60, days)
             
             # Using NewsAPI if available, otherwise use mock data
             if not self.api_key:
@@ -44,9 +93,13 @@ class NewsAPIClient:
                 "pageSize": 20
             }
 
-            response = requests.get(url, params=params, timeout=self.timeout)
+            # Stream the body and parse the raw bytes once; avoids the
+            # intermediate str requests builds for large article payloads
+            response = self.session.get(url, params=params,
+                                        timeout=self.timeout, stream=True)
             response.raise_for_status()
-            data = response.json()
+            raw = response.raw.read(decode_content=True)
+            data = _loads(raw)
 
             news = []
             if data.get("articles"):
@@ -57,7 +110,7 @@ class NewsAPIClient:
                         "url": article.get("url"),
                         "source": article.get("source", {}).get("name"),
                         "published_at": article.get("publishedAt"),
-                        "content": article.get("content")[:200] if article.get("content") else ""
+                        "content": (article.get("content") or "")[:200]
                     })
 
             self.cache.set_cache(cache_key, news, Config.CACHE_TTL_SECONDS)
@@ -68,22 +121,7 @@ class NewsAPIClient:
 
     def _get_mock_news(self, team_name: str) -> List[Dict]:
         """Return mock news data for demonstration."""
-        return [
-            {
-                "title": f"{team_name} secures important victory",
-                "description": f"In a thrilling match, {team_name} defeated their opponents",
-                "source": "Mock Sports News",
-                "published_at": datetime.now().isoformat(),
-                "content": "Mock news content for demonstration purposes"
-            },
-            {
-                "title": f"{team_name} stars shine in recent performance",
-                "description": f"Key players of {team_name} delivered outstanding performances",
-                "source": "Mock Sports News",
-                "published_at": (datetime.now() - timedelta(days=1)).isoformat(),
-                "content": "Mock news content for demonstration purposes"
-            }
-        ]
+        return _mock_news(team_name)
 
     def analyze_sentiment(self, articles: List[Dict]) -> float:
         """Analyze sentiment from news articles (basic)."""
@@ -92,20 +130,16 @@ class NewsAPIClient:
 
         try:
             # Simple sentiment analysis - count positive/negative keywords
-            positive_keywords = ["win", "victory", "strong", "excellent", "brilliant", "great"]
-            negative_keywords = ["loss", "defeat", "poor", "weak", "injured", "suspension"]
-
             positive_count = 0
             negative_count = 0
 
             for article in articles:
-                text = (article.get("title", "") + " " + 
-                       article.get("description", "")).lower()
-                
-                for keyword in positive_keywords:
-                    positive_count += text.count(keyword)
-                for keyword in negative_keywords:
-                    negative_count += text.count(keyword)
+                text = (article.get("title", "") + " " +
+                        article.get("description", "")).lower()
+
+                tokens = Counter(_TOKEN_RE.findall(text))
+                positive_count += sum(tokens[k] for k in _POSITIVE_KEYWORDS)
+                negative_count += sum(tokens[k] for k in _NEGATIVE_KEYWORDS)
 
             total = positive_count + negative_count
             if total == 0:
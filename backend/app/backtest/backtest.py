@@ -1,19 +1,53 @@
 """Backtesting module for evaluating model performance."""
+import math
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple
 from datetime import datetime, timedelta
-from database import Database
+from database import get_shared_database
 from logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Aggregate accuracy, log loss and Brier score inside SQLite so only four
+# scalars cross the wire instead of one row per prediction. The CASE picks
+# the probability assigned to the actual outcome; boolean comparisons
+# evaluate to 0/1, giving the one-hot terms for the Brier score.
+_METRICS_SQL = """
+    SELECT
+        AVG(CASE WHEN
+                (CASE WHEN m.home_score > m.away_score THEN p.home_probability
+                      WHEN m.home_score = m.away_score THEN p.draw_probability
+                      ELSE p.away_probability END) =
+                MAX(p.home_probability, p.draw_probability, p.away_probability)
+            THEN 1.0 ELSE 0.0 END) AS accuracy,
+        AVG(-LN(MAX(MIN(
+                (CASE WHEN m.home_score > m.away_score THEN p.home_probability
+                      WHEN m.home_score = m.away_score THEN p.draw_probability
+                      ELSE p.away_probability END), 1.0 - 1e-15), 1e-15))) AS log_loss,
+        AVG((
+            (p.home_probability - (m.home_score > m.away_score)) *
+            (p.home_probability - (m.home_score > m.away_score)) +
+            (p.draw_probability - (m.home_score = m.away_score)) *
+            (p.draw_probability - (m.home_score = m.away_score)) +
+            (p.away_probability - (m.home_score < m.away_score)) *
+            (p.away_probability - (m.home_score < m.away_score))
+        ) / 3.0) AS brier_score,
+        COUNT(*) AS n
+    FROM predictions p
+    JOIN matches m ON p.match_id = m.id
+    WHERE p.model_type = ? AND m.league_id = ?
+    AND m.match_date BETWEEN ? AND ?
+    AND m.home_score IS NOT NULL AND m.away_score IS NOT NULL
+"""
+
 
 class Backtester:
     """Backtest models on historical data."""
 
     def __init__(self):
         """Initialize backtester."""
-        self.db = Database()
+        self.db = get_shared_database()
 
     def backtest_models(self, league_id: int, start_date: str, end_date: str,
                        models: List[str] = None) -> Dict[str, Dict]:
@@ -22,11 +56,19 @@ class Backtester:
             if models is None:
                 models = ['poisson', 'negative_binomial', 'hawkes', 'hmm', 'ensemble']
 
-            results = {}
-            for model in models:
-                results[model] = self._backtest_single_model(
-                    league_id, start_date, end_date, model
-                )
+            # The per-model queries are independent and read-only, so
+            # overlap them; each thread opens its own connection and the
+            # wall time drops to the slowest single-model query
+            with ThreadPoolExecutor(max_workers=len(models)) as executor:
+                futures = {
+                    model: executor.submit(
+                        self._backtest_single_model,
+                        league_id, start_date, end_date, model
+                    )
+                    for model in models
+                }
+                results = {model: future.result()
+                           for model, future in futures.items()}
 
             return results
         except Exception as e:
@@ -38,23 +80,14 @@ class Backtester:
         """Backtest a single model."""
         try:
             conn = self.db.get_connection()
+            conn.create_function("LN", 1, math.log)
             cursor = conn.cursor()
 
-            # Get predictions and results
-            cursor.execute("""
-                SELECT p.home_probability, p.draw_probability, p.away_probability,
-                       p.predicted_score, m.home_score, m.away_score
-                FROM predictions p
-                JOIN matches m ON p.match_id = m.id
-                WHERE p.model_type = ? AND m.league_id = ?
-                AND m.match_date BETWEEN ? AND ?
-                AND m.home_score IS NOT NULL AND m.away_score IS NOT NULL
-            """, (model_type, league_id, start_date, end_date))
-
-            rows = cursor.fetchall()
-            conn.close()
+            # Single aggregating round-trip instead of shipping every row
+            cursor.execute(_METRICS_SQL, (model_type, league_id, start_date, end_date))
+            row = cursor.fetchone()
 
-            if not rows:
+            if not row or not row[3]:
                 return {
                     'accuracy': 0.0,
                     'log_loss': 0.0,
@@ -62,106 +95,19 @@ class Backtester:
                     'count': 0
                 }
 
-            # Calculate metrics
-            accuracy = self._calculate_accuracy(rows)
-            log_loss = self._calculate_log_loss(rows)
-            brier_score = self._calculate_brier_score(rows)
+            accuracy, log_loss, brier_score, count = row
 
             return {
-                'accuracy': accuracy,
-                'log_loss': log_loss,
-                'brier_score': brier_score,
-                'count': len(rows),
+                'accuracy': float(accuracy),
+                'log_loss': float(log_loss),
+                'brier_score': float(brier_score),
+                'count': int(count),
                 'model': model_type
             }
         except Exception as e:
             logger.error(f"Failed to backtest {model_type}: {e}")
             return {'accuracy': 0.0, 'log_loss': 0.0, 'brier_score': 0.0, 'count': 0}
 
-    def _calculate_accuracy(self, rows: List[Tuple]) -> float:
-        """Calculate prediction accuracy."""
-        try:
-            correct = 0
-            for row in rows:
-                home_prob, draw_prob, away_prob = row[:3]
-                home_score, away_score = row[4:]
-
-                # Actual result
-                if home_score > away_score:
-                    actual = 'home'
-                elif home_score == away_score:
-                    actual = 'draw'
-                else:
-                    actual = 'away'
-
-                # Predicted result
-                probs = {'home': home_prob, 'draw': draw_prob, 'away': away_prob}
-                predicted = max(probs, key=probs.get)
-
-                if actual == predicted:
-                    correct += 1
-
-            return correct / len(rows) if rows else 0.0
-        except Exception as e:
-            logger.error(f"Failed to calculate accuracy: {e}")
-            return 0.0
-
-    def _calculate_log_loss(self, rows: List[Tuple]) -> float:
-        """Calculate log loss."""
-        try:
-            total_loss = 0.0
-            epsilon = 1e-15
-
-            for row in rows:
-                home_prob, draw_prob, away_prob = row[:3]
-                home_score, away_score = row[4:]
-
-                # Actual probability
-                if home_score > away_score:
-                    actual_prob = home_prob
-                elif home_score == away_score:
-                    actual_prob = draw_prob
-                else:
-                    actual_prob = away_prob
-
-                # Clamp to avoid log(0)
-                actual_prob = max(min(actual_prob, 1.0 - epsilon), epsilon)
-                total_loss += -np.log(actual_prob)
-
-            return total_loss / len(rows) if rows else 0.0
-        except Exception as e:
-            logger.error(f"Failed to calculate log loss: {e}")
-            return 0.0
-
-    def _calculate_brier_score(self, rows: List[Tuple]) -> float:
-        """Calculate Brier score."""
-        try:
-            total_score = 0.0
-
-            for row in rows:
-                home_prob, draw_prob, away_prob = row[:3]
-                home_score, away_score = row[4:]
-
-                # Actual result (one-hot)
-                actual = np.zeros(3)
-                if home_score > away_score:
-                    actual[0] = 1
-                elif home_score == away_score:
-                    actual[1] = 1
-                else:
-                    actual[2] = 1
-
-                # Predicted probabilities
-                predicted = np.array([home_prob, draw_prob, away_prob])
-
-                # Brier score for this prediction
-                total_score += np.mean((predicted - actual) ** 2)
-
-            return total_score / len(rows) if rows else 0.0
-        except Exception as e:
-            logger.error(f"Failed to calculate Brier score: {e}")
-            return 0.0
-
     def get_calibration_data(self, league_id: int, model_type: str,
                             bins: int = 10) -> Dict[str, List[float]]:
         """Get calibration curve data."""
@@ -178,21 +124,27 @@ class Backtester:
             """, (model_type, league_id))
 
             rows = cursor.fetchall()
-            conn.close()
 
             bin_edges = np.linspace(0, 1, bins + 1)
-            bin_accuracy = []
-            bin_confidence = []
-
-            for i in range(bins):
-                mask = [(bin_edges[i] <= row[0] <= bin_edges[i + 1]) for row in rows]
-                bin_rows = [row for row, m in zip(rows, mask) if m]
-
-                if bin_rows:
-                    accuracy = sum(1 for row in bin_rows if row[1] > row[2]) / len(bin_rows)
-                    confidence = np.mean([row[0] for row in bin_rows])
-                    bin_accuracy.append(accuracy)
-                    bin_confidence.append(confidence)
+
+            if rows:
+                arr = np.array([tuple(row) for row in rows],
+                               dtype=[('hp', 'f8'), ('hs', 'i4'), ('as', 'i4')])
+                home_probs = arr['hp']
+                wins = (arr['hs'] > arr['as']).astype(np.float64)
+
+                # O(N) vectorized binning instead of per-bin membership scans
+                bin_idx = np.clip(np.digitize(home_probs, bin_edges) - 1, 0, bins - 1)
+                counts = np.bincount(bin_idx, minlength=bins)
+                acc_sum = np.bincount(bin_idx, weights=wins, minlength=bins)
+                conf_sum = np.bincount(bin_idx, weights=home_probs, minlength=bins)
+
+                nonempty = counts > 0
+                bin_accuracy = (acc_sum[nonempty] / counts[nonempty]).tolist()
+                bin_confidence = (conf_sum[nonempty] / counts[nonempty]).tolist()
+            else:
+                bin_accuracy = []
+                bin_confidence = []
 
             return {
                 'confidence': bin_confidence,
@@ -1,12 +1,77 @@
 """Caching system for the football prediction app."""
+import functools
 import json
-from datetime import datetime, timedelta
+import sqlite3
+import time
 from typing import Optional, Any
 from database import Database
 from logger import setup_logger
 
+try:
+    import msgspec
+    _ENC = msgspec.msgpack.Encoder()
+    _DEC = msgspec.msgpack.Decoder()
+except ImportError:  # msgspec is optional; fall back to stdlib json
+    msgspec = None
+    _ENC = None
+    _DEC = None
+
 logger = setup_logger(__name__)
 
+# Hot-path SQL hoisted to module constants so execute() always receives
+# the identical string and hits sqlite3's prepared-statement cache
+_SQL_GET = """
+    SELECT cache_value, value_kind FROM cache
+    WHERE cache_key = ?
+    AND (expires_at_unix IS NULL OR expires_at_unix > ?)
+"""
+
+_SQL_SET = """
+    INSERT OR REPLACE INTO cache
+    (cache_key, cache_value, ttl_seconds, expires_at_unix, value_kind)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_DELETE = "DELETE FROM cache WHERE cache_key = ?"
+
+_SQL_CLEAR = "DELETE FROM cache"
+
+# value_kind markers: how cache_value was stored
+_KIND_ENCODED = 0   # msgpack (or JSON fallback) from _encode_value
+_KIND_RAW_JSON = 1  # caller-supplied pre-serialized JSON bytes
+_KIND_TEXT = 2      # plain UTF-8 text stored verbatim
+
+
+def _encode_value(value: Any):
+    """Encode a cache value: msgpack bytes when available, else JSON."""
+    if _ENC is not None:
+        return sqlite3.Binary(_ENC.encode(value))
+    return json.dumps(value)
+
+
+def _decode_value(value, kind=None) -> Any:
+    """Decode a stored cache value, accepting legacy JSON rows.
+
+    The first-byte JSON sniff is only safe on untagged rows written
+    before value_kind existed: msgpack fixints 34, 91 and 123 encode
+    to the bytes '\"', '[' and '{', so sniffing a tagged msgpack row
+    would misparse it.
+    """
+    if isinstance(value, bytes):
+        if kind is None and value[:1] in (b"{", b"[", b'"'):
+            # Rows written before the msgpack switch are JSON text
+            return json.loads(value)
+        if _DEC is not None:
+            return _DEC.decode(value)
+        return json.loads(value)
+    return json.loads(value)
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_cache() -> "Cache":
+    """Return the process-wide Cache instance."""
+    return Cache()
+
 
 class Cache:
     """Cache manager using SQLite backend."""
@@ -14,81 +79,141 @@ class Cache:
     def __init__(self, db: Database = None):
         """Initialize cache."""
         self.db = db or Database()
+        # In-process memo in front of SQLite: repeated reads of a hot
+        # key within one process skip the query and the decode entirely
+        self._mem = {}
+        self._mem_max = 1024
+
+    def _remember(self, key: str, value: Any, ttl_seconds: int = None):
+        """Keep the deserialized value in memory, evicting FIFO when full."""
+        if len(self._mem) >= self._mem_max:
+            self._mem.pop(next(iter(self._mem)), None)
+        expires = (time.time() + ttl_seconds
+                   if ttl_seconds and ttl_seconds > 0 else None)
+        self._mem[key] = (expires, value)
 
     def get_cache(self, key: str) -> Optional[Any]:
         """Get value from cache."""
+        entry = self._mem.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires is None or expires > time.time():
+                return value
+            self._mem.pop(key, None)
+
         conn = self.db.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT cache_value FROM cache 
-            WHERE cache_key = ? 
-            AND (expires_at IS NULL OR expires_at > datetime('now'))
-        """, (key,))
+        cursor.execute(_SQL_GET, (key, int(time.time())))
         row = cursor.fetchone()
-        conn.close()
-
         if row:
+            value, kind = row
             try:
-                return json.loads(row[0])
-            except (json.JSONDecodeError, TypeError):
+                if kind == _KIND_RAW_JSON:
+                    return json.loads(value)
+                if kind == _KIND_TEXT:
+                    return value.decode() if isinstance(value, bytes) else value
+                return _decode_value(value, kind)
+            except Exception:
                 logger.error(f"Failed to decode cache for key: {key}")
                 return None
         return None
 
     def set_cache(self, key: str, value: Any, ttl_seconds: int = None) -> bool:
         """Set cache value."""
+        # Encoding is pure CPU; keep it (and the expiry arithmetic)
+        # outside the narrow DB try block. Already-serialized payloads
+        # and plain text skip the encode entirely and are tagged so
+        # get_cache knows how to hand them back
+        if isinstance(value, (bytes, bytearray)):
+            cache_value = sqlite3.Binary(bytes(value))
+            kind = _KIND_RAW_JSON
+        elif isinstance(value, str):
+            cache_value = value
+            kind = _KIND_TEXT
+        else:
+            cache_value = _encode_value(value)
+            kind = _KIND_ENCODED
+
+        # Expiry is two integer adds; no datetime objects or ISO strings
+        expires_at_unix = (int(time.time()) + ttl_seconds
+                           if ttl_seconds and ttl_seconds > 0 else None)
+
+        conn = self.db.get_connection()
         try:
-            cache_value = json.dumps(value)
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-
-            expires_at = None
-            if ttl_seconds and ttl_seconds > 0:
-                expires_at = (datetime.now() + 
-                             timedelta(seconds=ttl_seconds)).isoformat()
-
-            cursor.execute("""
-                INSERT OR REPLACE INTO cache 
-                (cache_key, cache_value, ttl_seconds, expires_at)
-                VALUES (?, ?, ?, ?)
-            """, (key, cache_value, ttl_seconds, expires_at))
+            conn.execute(_SQL_SET, (key, cache_value, ttl_seconds,
+                                    expires_at_unix, kind))
             conn.commit()
-            conn.close()
-            return True
-        except Exception as e:
+        except sqlite3.Error as e:
             logger.error(f"Failed to set cache: {e}")
             return False
 
+        if kind == _KIND_RAW_JSON:
+            # get_cache parses raw bytes on read; don't memoize them
+            self._mem.pop(key, None)
+        else:
+            self._remember(key, value, ttl_seconds)
+        return True
+
+    def get_cache_raw(self, key: str) -> Optional[bytes]:
+        """Get a cached value as raw bytes, skipping deserialization."""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_GET, (key, int(time.time())))
+        row = cursor.fetchone()
+        if row:
+            value = row[0]
+            return value if isinstance(value, bytes) else value.encode()
+        return None
+
+    def set_cache_raw(self, key: str, value: bytes,
+                      ttl_seconds: int = None) -> bool:
+        """Store already-serialized bytes without re-encoding them."""
+        expires_at_unix = (int(time.time()) + ttl_seconds
+                           if ttl_seconds and ttl_seconds > 0 else None)
+
+        conn = self.db.get_connection()
+        try:
+            conn.execute(_SQL_SET, (key, value, ttl_seconds,
+                                    expires_at_unix, _KIND_RAW_JSON))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to set raw cache: {e}")
+            return False
+
+        self._mem.pop(key, None)
+        return True
+
     def delete_cache(self, key: str) -> bool:
         """Delete cache entry."""
+        conn = self.db.get_connection()
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM cache WHERE cache_key = ?", (key,))
+            conn.execute(_SQL_DELETE, (key,))
             conn.commit()
-            conn.close()
-            return True
-        except Exception as e:
+        except sqlite3.Error as e:
             logger.error(f"Failed to delete cache: {e}")
             return False
+        self._mem.pop(key, None)
+        return True
 
     def clear_all_cache(self) -> bool:
         """Clear all cache entries."""
+        conn = self.db.get_connection()
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM cache")
+            conn.execute(_SQL_CLEAR)
             conn.commit()
-            conn.close()
-            return True
-        except Exception as e:
+        except sqlite3.Error as e:
             logger.error(f"Failed to clear cache: {e}")
             return False
+        self._mem.clear()
+        return True
 
     def cleanup_expired(self):
         """Clean up expired cache entries."""
         try:
             self.db.clean_expired_cache()
+            now = time.time()
+            self._mem = {k: v for k, v in self._mem.items()
+                         if v[0] is None or v[0] > now}
             logger.info("Cache cleanup completed")
         except Exception as e:
             logger.error(f"Failed to cleanup cache: {e}")
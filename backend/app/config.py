@@ -3,11 +3,25 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-ENV_FILE = Path(__file__).parent.parent.parent / ".env"
-if not ENV_FILE.exists():
-    ENV_FILE = Path(__file__).parent / ".env"
-load_dotenv(ENV_FILE)
+# Env-file resolution runs exactly once per process; re-imports and
+# workers re-entering the module skip the stat syscalls entirely
+_BOOTSTRAPPED = False
+ENV_FILE = None
+
+
+def _bootstrap():
+    """Resolve and load the env file once."""
+    global _BOOTSTRAPPED, ENV_FILE
+    if _BOOTSTRAPPED:
+        return
+    ENV_FILE = Path(__file__).parent.parent.parent / ".env"
+    if not ENV_FILE.exists():
+        ENV_FILE = Path(__file__).parent / ".env"
+    load_dotenv(ENV_FILE)
+    _BOOTSTRAPPED = True
+
+
+_bootstrap()
 
 
 class Config:
@@ -33,6 +47,11 @@ class Config:
 
     # Cache Configuration
     CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "3600"))
+    # Content-class TTLs: finished matches never change, squads change
+    # rarely, fixture lists change often
+    CACHE_TTL_IMMUTABLE = int(os.getenv("CACHE_TTL_IMMUTABLE", str(86400 * 30)))
+    CACHE_TTL_SQUAD = int(os.getenv("CACHE_TTL_SQUAD", "86400"))
+    CACHE_TTL_FIXTURES = int(os.getenv("CACHE_TTL_FIXTURES", "600"))
 
     # Database
     DATABASE_PATH = os.getenv(
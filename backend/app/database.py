@@ -1,6 +1,12 @@
 """Database management for the football prediction app."""
+import atexit
+import contextlib
+import functools
 import sqlite3
 import json
+import threading
+import time
+import aiosqlite
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -9,22 +15,285 @@ from logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Connection tuning shared by the sync and async connect paths: WAL so
+# readers never block the writer, NORMAL sync (durable enough under
+# WAL), in-memory temp tables, a 64MB page cache and mmap'd reads
+_PRAGMA_SCRIPT = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA mmap_size=268435456;
+"""
+
+# Hot-path SQL hoisted to module constants so execute() always receives
+# the identical string and hits sqlite3's prepared-statement cache
+# instead of re-parsing and re-planning per call
+# Upserts use ON CONFLICT DO UPDATE rather than INSERT OR REPLACE:
+# REPLACE is a DELETE plus INSERT, which rewrites every index entry,
+# assigns a new rowid and breaks foreign keys pointing at the row
+_SQL_UPSERT_TEAM = """
+    INSERT INTO teams (id, name, country, founded_year)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        name = excluded.name,
+        country = excluded.country,
+        founded_year = excluded.founded_year,
+        last_updated = CURRENT_TIMESTAMP
+"""
+
+_SQL_GET_TEAM = "SELECT * FROM teams WHERE id = ?"
+
+_SQL_UPSERT_MATCH = """
+    INSERT INTO matches
+    (external_id, home_team_id, away_team_id, home_team_name,
+     away_team_name, league_id, match_date, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(external_id) DO UPDATE SET
+        home_team_id = excluded.home_team_id,
+        away_team_id = excluded.away_team_id,
+        home_team_name = excluded.home_team_name,
+        away_team_name = excluded.away_team_name,
+        league_id = excluded.league_id,
+        match_date = excluded.match_date,
+        status = excluded.status
+"""
+
+_SQL_GET_MATCH = "SELECT * FROM matches WHERE id = ?"
+
+_SQL_UPCOMING_MATCHES = """
+    SELECT * FROM matches
+    WHERE league_id = ? AND status = 'SCHEDULED'
+    AND match_date > datetime('now')
+    AND match_date < datetime('now', '+' || ? || ' days')
+    ORDER BY match_date ASC
+"""
+
+_SQL_ADD_PREDICTION = """
+    INSERT INTO predictions
+    (match_id, model_type, home_probability, draw_probability,
+     away_probability, predicted_score, confidence, explanation)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_GET_PREDICTIONS = """
+    SELECT * FROM predictions WHERE match_id = ? ORDER BY created_at DESC
+"""
+
+_SQL_UPDATE_EXPLANATION = """
+    UPDATE predictions SET explanation = ?
+    WHERE id = (
+        SELECT id FROM predictions
+        WHERE match_id = ? AND model_type = ?
+        ORDER BY created_at DESC, id DESC LIMIT 1
+    )
+"""
+
+_SQL_ADD_RESULT = """
+    INSERT INTO results
+    (match_id, prediction_id, actual_result, accuracy_score, log_loss, brier_score)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPSERT_MODEL_METRICS = """
+    INSERT INTO model_metrics
+    (model_type, metric_type, metric_value, period_start, period_end, sample_size)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(model_type, metric_type, period_start, period_end) DO UPDATE SET
+        metric_value = excluded.metric_value,
+        sample_size = excluded.sample_size,
+        calculated_at = CURRENT_TIMESTAMP
+"""
+
+_SQL_GET_METRICS_BY_TYPE = """
+    SELECT * FROM model_metrics WHERE model_type = ? ORDER BY calculated_at DESC
+"""
+
+_SQL_GET_METRICS_ALL = "SELECT * FROM model_metrics ORDER BY calculated_at DESC"
+
+_SQL_UPSERT_TEAM_STATS = """
+    INSERT INTO team_stats
+    (team_id, matches_played, wins, draws, losses, goals_for,
+     goals_against, form_rating)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(team_id) DO UPDATE SET
+        matches_played = excluded.matches_played,
+        wins = excluded.wins,
+        draws = excluded.draws,
+        losses = excluded.losses,
+        goals_for = excluded.goals_for,
+        goals_against = excluded.goals_against,
+        form_rating = excluded.form_rating,
+        last_updated = CURRENT_TIMESTAMP
+"""
+
+_SQL_GET_TEAM_STATS = "SELECT * FROM team_stats WHERE team_id = ?"
+
+_SQL_CLEAN_EXPIRED_CACHE = """
+    DELETE FROM cache
+    WHERE expires_at_unix IS NOT NULL AND expires_at_unix < ?
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_database() -> "Database":
+    """Return the process-wide Database instance."""
+    return Database()
+
 
 class Database:
     """SQLite database manager."""
 
+    # Directories already created this process; skips two stat
+    # syscalls per Database() in tests and worker processes
+    _db_dirs_created = set()
+
     def __init__(self, db_path: str = None):
         """Initialize database."""
         self.db_path = db_path or Config.DATABASE_PATH
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        db_dir = Path(self.db_path).parent
+        if db_dir not in self._db_dirs_created:
+            db_dir.mkdir(parents=True, exist_ok=True)
+            self._db_dirs_created.add(db_dir)
+        self._local = threading.local()
+        # One connection per live thread, keyed by the owning Thread so
+        # connections can be reaped once their owner exits
+        self._conns = {}
+        self._conns_lock = threading.Lock()
+        self.aio_conn = None
+        atexit.register(self.close)
         self.init_db()
 
     def get_connection(self):
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Get this thread's persistent database connection.
+
+        Opening a fresh connection per call costs syscalls and a cold
+        SQLite page cache every time; instead each thread keeps one
+        long-lived connection configured for WAL so readers and the
+        writer no longer block each other.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread off: the thread-local still confines
+            # each connection to its owner while it lives, but lets
+            # the reaper and atexit close handles whose thread is gone
+            conn = sqlite3.connect(self.db_path, cached_statements=256,
+                                   check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_PRAGMA_SCRIPT)
+            self._local.conn = conn
+            with self._conns_lock:
+                self._reap_dead_conns()
+                self._conns[threading.current_thread()] = conn
         return conn
 
+    def _reap_dead_conns(self):
+        """Close connections whose owning thread has exited.
+
+        Pool threads from the prefetchers, backtests and feature
+        producer come and go; without this each one left its WAL
+        connection open until process exit. Caller holds _conns_lock.
+        """
+        for thread in [t for t in self._conns if not t.is_alive()]:
+            try:
+                self._conns.pop(thread).close()
+            except sqlite3.Error:
+                pass
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Group writes into one explicit transaction.
+
+        sqlite3 otherwise opens and commits a transaction per statement,
+        paying one fsync per row; wrapping an ingestion loop in this
+        context manager turns that into a single BEGIN IMMEDIATE/COMMIT.
+        """
+        conn = self.get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.in_txn = True
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.in_txn = False
+
+    def _commit(self, conn):
+        """Commit unless a transaction() block is open on this thread."""
+        if not getattr(self._local, "in_txn", False):
+            conn.commit()
+
+    async def init_aio(self):
+        """Open the shared aiosqlite connection for async reads.
+
+        Read-only endpoints await queries on this connection instead
+        of blocking the event loop; writes stay on the sync
+        connections since SQLite serializes them anyway.
+        """
+        if self.aio_conn is None:
+            conn = await aiosqlite.connect(self.db_path)
+            conn.row_factory = aiosqlite.Row
+            await conn.executescript(_PRAGMA_SCRIPT)
+            self.aio_conn = conn
+        return self.aio_conn
+
+    async def close_aio(self):
+        """Close the async connection."""
+        if self.aio_conn is not None:
+            await self.aio_conn.close()
+            self.aio_conn = None
+
+    async def aget_upcoming_matches(self, league_id: int, days: int = 7) -> List[Dict]:
+        """Async twin of get_upcoming_matches."""
+        conn = await self.init_aio()
+        async with conn.execute(_SQL_UPCOMING_MATCHES, (league_id, days)) as cursor:
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    async def aget_predictions(self, match_id: int) -> List[Dict]:
+        """Async twin of get_predictions."""
+        conn = await self.init_aio()
+        async with conn.execute(_SQL_GET_PREDICTIONS, (match_id,)) as cursor:
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    async def aget_model_metrics(self, model_type: str = None) -> List[Dict]:
+        """Async twin of get_model_metrics."""
+        conn = await self.init_aio()
+        if model_type:
+            cursor = await conn.execute(_SQL_GET_METRICS_BY_TYPE, (model_type,))
+        else:
+            cursor = await conn.execute(_SQL_GET_METRICS_ALL)
+        rows = await cursor.fetchall()
+        await cursor.close()
+        return [dict(row) for row in rows]
+
+    def discard_connections(self):
+        """Forget every connection handle without closing it.
+
+        For forked children: the inherited sqlite3 connections belong
+        to the parent process and must be neither used nor closed on
+        this side of the fork(). Dropping the references forces fresh
+        connections on next use.
+        """
+        with self._conns_lock:
+            self._conns.clear()
+        self._local = threading.local()
+        self.aio_conn = None
+
+    def close(self):
+        """Close every connection opened by this database."""
+        with self._conns_lock:
+            for conn in self._conns.values():
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._conns.clear()
+        self._local = threading.local()
+
     def init_db(self):
         """Initialize database tables."""
         conn = self.get_connection()
@@ -117,13 +386,31 @@ class Database:
             CREATE TABLE IF NOT EXISTS cache (
                 id INTEGER PRIMARY KEY,
                 cache_key TEXT UNIQUE NOT NULL,
-                cache_value TEXT NOT NULL,
+                cache_value BLOB NOT NULL,
                 ttl_seconds INTEGER,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                expires_at TIMESTAMP
+                expires_at TIMESTAMP,
+                expires_at_unix INTEGER,
+                value_kind INTEGER
             )
         """)
 
+        # Integer epoch expiry: comparing two INTEGERs is far cheaper
+        # than parsing ISO8601 text with datetime('now') per lookup
+        cache_columns = [row[1] for row in cursor.execute("PRAGMA table_info(cache)")]
+        if "expires_at_unix" not in cache_columns:
+            cursor.execute("ALTER TABLE cache ADD COLUMN expires_at_unix INTEGER")
+            # Backfill from the legacy ISO text column so pre-upgrade
+            # rows keep their TTL — the read filter and the sweeper
+            # only consult the integer column
+            cursor.execute("""
+                UPDATE cache
+                SET expires_at_unix = CAST(strftime('%s', expires_at) AS INTEGER)
+                WHERE expires_at IS NOT NULL AND expires_at_unix IS NULL
+            """)
+        if "value_kind" not in cache_columns:
+            cursor.execute("ALTER TABLE cache ADD COLUMN value_kind INTEGER")
+
         # Team statistics table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS team_stats (
@@ -160,29 +447,61 @@ class Database:
             )
         """)
 
+        # Indexes for the hot query paths; without them the filtered
+        # SELECTs below scan the whole table
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_matches_league_status_date
+            ON matches(league_id, status, match_date)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_predictions_match
+            ON predictions(match_id, created_at DESC)
+        """)
+        cursor.execute("DROP INDEX IF EXISTS idx_cache_expires")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cache_expires_unix
+            ON cache(expires_at_unix) WHERE expires_at_unix IS NOT NULL
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_model_metrics_type_time
+            ON model_metrics(model_type, calculated_at DESC)
+        """)
+        # team_stats never had a uniqueness guarantee on team_id, so
+        # repeated saves stacked duplicate rows; keep the newest row
+        # per team and enforce uniqueness so the upsert has a target
+        cursor.execute("DROP INDEX IF EXISTS idx_team_stats_team")
+        cursor.execute("""
+            DELETE FROM team_stats WHERE id NOT IN
+            (SELECT MAX(id) FROM team_stats GROUP BY team_id)
+        """)
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_team_stats_team_unique
+            ON team_stats(team_id)
+        """)
+        cursor.execute("ANALYZE")
+
         conn.commit()
-        conn.close()
         logger.info("Database initialized")
 
     # Teams operations
     def add_team(self, team_id: int, name: str, country: str = None, founded_year: int = None):
         """Add or update a team."""
+        self.add_teams([(team_id, name, country, founded_year)])
+
+    def add_teams(self, rows: List[tuple]):
+        """Add or update many teams in one transaction."""
+        if not rows:
+            return
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO teams (id, name, country, founded_year)
-            VALUES (?, ?, ?, ?)
-        """, (team_id, name, country, founded_year))
-        conn.commit()
-        conn.close()
+        conn.executemany(_SQL_UPSERT_TEAM, rows)
+        self._commit(conn)
 
     def get_team(self, team_id: int) -> Optional[Dict]:
         """Get team by ID."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM teams WHERE id = ?", (team_id,))
+        cursor.execute(_SQL_GET_TEAM, (team_id,))
         row = cursor.fetchone()
-        conn.close()
         return dict(row) if row else None
 
     # Matches operations
@@ -190,41 +509,97 @@ class Database:
                   home_team_name: str, away_team_name: str, league_id: int,
                   match_date: str, **kwargs):
         """Add or update a match."""
+        self.add_matches([(external_id, home_team_id, away_team_id,
+                           home_team_name, away_team_name, league_id,
+                           match_date, kwargs.get('status', 'SCHEDULED'))])
+
+    def add_matches(self, rows: List[tuple]):
+        """Add or update many matches in one transaction.
+
+        Ingesting N matches through add_match costs N commits (one
+        fsync each); executemany inside a single transaction pays one.
+        """
+        if not rows:
+            return
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO matches 
-            (external_id, home_team_id, away_team_id, home_team_name, 
-             away_team_name, league_id, match_date, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (external_id, home_team_id, away_team_id, home_team_name, 
-              away_team_name, league_id, match_date, kwargs.get('status', 'SCHEDULED')))
-        conn.commit()
-        conn.close()
+        conn.executemany(_SQL_UPSERT_MATCH, rows)
+        self._commit(conn)
 
     def get_match(self, match_id: int) -> Optional[Dict]:
         """Get match by ID."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM matches WHERE id = ?", (match_id,))
+        cursor.execute(_SQL_GET_MATCH, (match_id,))
         row = cursor.fetchone()
-        conn.close()
         return dict(row) if row else None
 
+    def iter_upcoming_matches(self, league_id: int, days: int = 7):
+        """Yield upcoming matches without materializing the full set.
+
+        Streams batches through fetchmany so large league/day windows
+        never hold more than one batch of rows at a time.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.arraysize = 200
+        cursor.execute(_SQL_UPCOMING_MATCHES, (league_id, days))
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+
     def get_upcoming_matches(self, league_id: int, days: int = 7) -> List[Dict]:
         """Get upcoming matches."""
+        return list(self.iter_upcoming_matches(league_id, days))
+
+    def get_historical_goals_batch(self, team_ids: List[int], league_id: int,
+                                   num_matches: int = 20) -> Dict[int, Dict]:
+        """Fetch recent scored matches for many teams in one query.
+
+        Replaces the per-team lookups in the prediction pipeline: one
+        IN query per ~999 ids (SQLite's bound-parameter cap) and the
+        rows are bucketed per team on the way past, newest first.
+        """
+        ids = list(dict.fromkeys(team_ids))
+        out = {tid: {"home_goals": [], "away_goals": [], "results": []}
+               for tid in ids}
+        if not ids:
+            return out
+
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM matches 
-            WHERE league_id = ? AND status = 'SCHEDULED'
-            AND match_date > datetime('now')
-            AND match_date < datetime('now', '+' || ? || ' days')
-            ORDER BY match_date ASC
-        """, (league_id, days))
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        for start in range(0, len(ids), 999):
+            chunk = ids[start:start + 999]
+            marks = ",".join("?" * len(chunk))
+            cursor.execute(f"""
+                SELECT home_team_id, away_team_id, home_score, away_score
+                FROM matches
+                WHERE league_id = ? AND home_score IS NOT NULL
+                AND (home_team_id IN ({marks}) OR away_team_id IN ({marks}))
+                ORDER BY match_date DESC
+            """, (league_id, *chunk, *chunk))
+            for home_id, away_id, home_score, away_score in cursor.fetchall():
+                if home_score > away_score:
+                    result = 1.0
+                elif home_score == away_score:
+                    result = 0.5
+                else:
+                    result = 0.0
+                bucket = out.get(home_id)
+                if bucket is not None:
+                    if len(bucket["home_goals"]) < num_matches:
+                        bucket["home_goals"].append(home_score or 0)
+                    if len(bucket["results"]) < num_matches:
+                        bucket["results"].append(result)
+                bucket = out.get(away_id)
+                if bucket is not None:
+                    if len(bucket["away_goals"]) < num_matches:
+                        bucket["away_goals"].append(away_score or 0)
+                    if len(bucket["results"]) < num_matches:
+                        bucket["results"].append(result)
+        return out
 
     # Predictions operations
     def add_prediction(self, match_id: int, model_type: str, home_prob: float,
@@ -233,42 +608,51 @@ class Database:
         """Add a prediction."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO predictions 
-            (match_id, model_type, home_probability, draw_probability, 
-             away_probability, predicted_score, confidence, explanation)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (match_id, model_type, home_prob, draw_prob, away_prob, 
-              predicted_score, confidence, explanation))
-        conn.commit()
+        cursor.execute(_SQL_ADD_PREDICTION,
+                       (match_id, model_type, home_prob, draw_prob, away_prob,
+                        predicted_score, confidence, explanation))
+        self._commit(conn)
         prediction_id = cursor.lastrowid
-        conn.close()
         return prediction_id
 
+    def add_predictions(self, rows: List[tuple]):
+        """Add many predictions in one transaction."""
+        if not rows:
+            return
+        conn = self.get_connection()
+        conn.executemany(_SQL_ADD_PREDICTION, rows)
+        self._commit(conn)
+
+    def update_prediction_explanation(self, match_id: int, model_type: str,
+                                      explanation: str):
+        """Attach an explanation to the latest prediction for a match."""
+        conn = self.get_connection()
+        conn.execute(_SQL_UPDATE_EXPLANATION,
+                     (explanation, match_id, model_type))
+        self._commit(conn)
+
     def get_predictions(self, match_id: int) -> List[Dict]:
         """Get predictions for a match."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM predictions WHERE match_id = ? ORDER BY created_at DESC
-        """, (match_id,))
+        cursor.execute(_SQL_GET_PREDICTIONS, (match_id,))
         rows = cursor.fetchall()
-        conn.close()
         return [dict(row) for row in rows]
 
     # Results operations
     def add_result(self, match_id: int, prediction_id: int, actual_result: str,
                    accuracy: float = None, log_loss: float = None, brier: float = None):
         """Add a match result."""
+        self.add_results([(match_id, prediction_id, actual_result,
+                           accuracy, log_loss, brier)])
+
+    def add_results(self, rows: List[tuple]):
+        """Add many match results in one transaction."""
+        if not rows:
+            return
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO results 
-            (match_id, prediction_id, actual_result, accuracy_score, log_loss, brier_score)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (match_id, prediction_id, actual_result, accuracy, log_loss, brier))
-        conn.commit()
-        conn.close()
+        conn.executemany(_SQL_ADD_RESULT, rows)
+        self._commit(conn)
 
     # Model metrics operations
     def save_model_metrics(self, model_type: str, metric_type: str, metric_value: float,
@@ -277,61 +661,77 @@ class Database:
         """Save model metrics."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO model_metrics 
-            (model_type, metric_type, metric_value, period_start, period_end, sample_size)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (model_type, metric_type, metric_value, period_start, period_end, sample_size))
-        conn.commit()
-        conn.close()
+        cursor.execute(_SQL_UPSERT_MODEL_METRICS,
+                       (model_type, metric_type, metric_value,
+                        period_start, period_end, sample_size))
+        self._commit(conn)
 
     def get_model_metrics(self, model_type: str = None) -> List[Dict]:
         """Get model metrics."""
         conn = self.get_connection()
         cursor = conn.cursor()
         if model_type:
-            cursor.execute("""
-                SELECT * FROM model_metrics WHERE model_type = ? ORDER BY calculated_at DESC
-            """, (model_type,))
+            cursor.execute(_SQL_GET_METRICS_BY_TYPE, (model_type,))
         else:
-            cursor.execute("SELECT * FROM model_metrics ORDER BY calculated_at DESC")
+            cursor.execute(_SQL_GET_METRICS_ALL)
         rows = cursor.fetchall()
-        conn.close()
         return [dict(row) for row in rows]
 
     # Stats operations
     def save_team_stats(self, team_id: int, stats: Dict):
         """Save team statistics."""
+        self.save_team_stats_bulk([(team_id, stats)])
+
+    def save_team_stats_bulk(self, items: List[tuple]):
+        """Save statistics for many (team_id, stats) pairs in one transaction."""
+        if not items:
+            return
+        rows = [
+            (team_id, stats.get('matches_played', 0), stats.get('wins', 0),
+             stats.get('draws', 0), stats.get('losses', 0),
+             stats.get('goals_for', 0), stats.get('goals_against', 0),
+             stats.get('form_rating', 0.0))
+            for team_id, stats in items
+        ]
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO team_stats 
-            (team_id, matches_played, wins, draws, losses, goals_for, 
-             goals_against, form_rating)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (team_id, stats.get('matches_played', 0), stats.get('wins', 0),
-              stats.get('draws', 0), stats.get('losses', 0), 
-              stats.get('goals_for', 0), stats.get('goals_against', 0),
-              stats.get('form_rating', 0.0)))
-        conn.commit()
-        conn.close()
+        conn.executemany(_SQL_UPSERT_TEAM_STATS, rows)
+        self._commit(conn)
 
     def get_team_stats(self, team_id: int) -> Optional[Dict]:
         """Get team statistics."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM team_stats WHERE team_id = ?", (team_id,))
+        cursor.execute(_SQL_GET_TEAM_STATS, (team_id,))
         row = cursor.fetchone()
-        conn.close()
         return dict(row) if row else None
 
+    def get_team_stats_many(self, team_ids: List[int]) -> Dict[int, Dict]:
+        """Get statistics for many teams with one IN query.
+
+        Teams without a stats row map to an empty dict so callers can
+        tell "known missing" apart from "not prefetched".
+        """
+        ids = list(dict.fromkeys(team_ids))
+        out = {tid: {} for tid in ids}
+        if not ids:
+            return out
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        for start in range(0, len(ids), 999):
+            chunk = ids[start:start + 999]
+            marks = ",".join("?" * len(chunk))
+            cursor.execute(
+                f"SELECT * FROM team_stats WHERE team_id IN ({marks})",
+                chunk)
+            for row in cursor.fetchall():
+                stats = dict(row)
+                out[stats['team_id']] = stats
+        return out
+
     def clean_expired_cache(self):
         """Clean expired cache entries."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            DELETE FROM cache 
-            WHERE expires_at IS NOT NULL AND expires_at < datetime('now')
-        """)
-        conn.commit()
-        conn.close()
+        cursor.execute(_SQL_CLEAN_EXPIRED_CACHE, (int(time.time()),))
+        self._commit(conn)
\ No newline at end of file
@@ -1,10 +1,18 @@
 """Explainability module for generating explanations."""
+import asyncio
 from typing import Dict, List
 from api_clients.llm_api import LLMAPIClient
 from logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Parsed once at import; the fallback runs on every LLM failure
+_DEFAULT_TEMPLATE = (
+    "Our model predicts {home} vs {away} will end {score}. "
+    "The home team has a {home_prob:.0f}% chance of winning, "
+    "with {confidence:.0f}% confidence based on recent form and statistics."
+)
+
 
 class Explainability:
     """Generate explanations for predictions."""
@@ -13,25 +21,48 @@ class Explainability:
         """Initialize explainability module."""
         self.llm = LLMAPIClient()
 
-    def explain_prediction(self, match_data: Dict, prediction: Dict,
-                          features: Dict = None, articles: List[Dict] = None) -> str:
-        """Generate comprehensive explanation for a prediction."""
+    async def explain_prediction(self, match_data: Dict, prediction: Dict,
+                                 features: Dict = None, articles: List[Dict] = None) -> str:
+        """Generate comprehensive explanation for a prediction.
+
+        The LLM call is blocking network I/O, so it runs in a worker
+        thread instead of stalling the event loop.
+        """
         try:
-            # Get LLM explanation
-            explanation = self.llm.generate_explanation(match_data, prediction)
-            return explanation
+            return await asyncio.to_thread(
+                self.llm.generate_explanation, match_data, prediction
+            )
         except Exception as e:
             logger.error(f"Failed to explain prediction: {e}")
             return self._get_default_explanation(match_data, prediction)
 
+    async def explain_many(self, items: List[tuple],
+                           concurrency: int = 8) -> List[str]:
+        """Explain many (match_data, prediction) pairs concurrently.
+
+        Fires all LLM requests at once, bounded by a semaphore so the
+        provider isn't flooded; total latency approaches the slowest
+        single call instead of the sum.
+        """
+        if not items:
+            return []
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(match_data, prediction):
+            async with semaphore:
+                return await self.explain_prediction(match_data, prediction)
+
+        return list(await asyncio.gather(
+            *(bounded(match_data, prediction) for match_data, prediction in items)
+        ))
+
     def _get_default_explanation(self, match_data: Dict, prediction: Dict) -> str:
         """Generate default explanation."""
-        home = match_data.get('home_team', 'Home')
-        away = match_data.get('away_team', 'Away')
-        score = prediction.get('predicted_score', '1-1')
-        confidence = prediction.get('confidence', 0) * 100
-        home_prob = prediction.get('home_probability', 0) * 100
-
-        return (f"Our model predicts {home} vs {away} will end {score}. "
-                f"The home team has a {home_prob:.0f}% chance of winning, "
-                f"with {confidence:.0f}% confidence based on recent form and statistics.")
+        return _DEFAULT_TEMPLATE.format(
+            home=match_data.get('home_team', 'Home'),
+            away=match_data.get('away_team', 'Away'),
+            score=prediction.get('predicted_score', '1-1'),
+            home_prob=prediction.get('home_probability', 0) * 100,
+            confidence=prediction.get('confidence', 0) * 100,
+        )
@@ -4,12 +4,15 @@ import logging.handlers
 from pathlib import Path
 from config import Config
 
+# Handlers are built once and shared across loggers: every module calls
+# setup_logger at import time, and each RotatingFileHandler would
+# otherwise open its own handle on the same log file
+_LOGGERS = {}
+_SHARED_HANDLERS = None
 
-def setup_logger(name: str = "football_app") -> logging.Logger:
-    """Setup and return configured logger."""
-    logger = logging.getLogger(name)
-    logger.setLevel(Config.LOG_LEVEL)
 
+def _build_handlers():
+    """Build the console and rotating file handlers once per process."""
     # Create logs directory if needed
     log_path = Path(Config.LOG_FILE)
     log_path.parent.mkdir(parents=True, exist_ok=True)
@@ -34,9 +37,26 @@ def setup_logger(name: str = "football_app") -> logging.Logger:
     console_handler.setFormatter(formatter)
     file_handler.setFormatter(formatter)
 
+    return [console_handler, file_handler]
+
+
+def setup_logger(name: str = "football_app") -> logging.Logger:
+    """Setup and return configured logger."""
+    logger = _LOGGERS.get(name)
+    if logger is not None:
+        return logger
+
+    global _SHARED_HANDLERS
+    if _SHARED_HANDLERS is None:
+        _SHARED_HANDLERS = _build_handlers()
+
+    logger = logging.getLogger(name)
+    logger.setLevel(Config.LOG_LEVEL)
+
     # Add handlers
     if not logger.handlers:
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        for handler in _SHARED_HANDLERS:
+            logger.addHandler(handler)
 
+    _LOGGERS[name] = logger
     return logger
@@ -1,12 +1,14 @@
 """Main FastAPI backend application."""
+import asyncio
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+import orjson
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Optional
 from datetime import datetime
@@ -14,9 +16,11 @@ import uvicorn
 
 from config import Config
 from database import Database
+from cache import get_shared_cache
 from logger import setup_logger
 from api_clients.football_api import FootballAPIClient
 from api_clients.news_api import NewsAPIClient
+from api_clients.async_api import AsyncNewsAPIClient
 from prediction.predict import PredictionPipeline
 from backtest.backtest import Backtester
 from explainability.explain import Explainability
@@ -27,7 +31,8 @@ logger = setup_logger(__name__)
 app = FastAPI(
     title="Football Prediction API",
     description="Advanced statistical football match prediction",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware for Electron
@@ -41,23 +46,56 @@ app.add_middleware(
 
 # Initialize services
 db = Database()
+cache = get_shared_cache()
 football_api = FootballAPIClient()
 news_api = NewsAPIClient()
+async_news_api = AsyncNewsAPIClient()
 pipeline = PredictionPipeline()
 backtester = Backtester()
 explainability = Explainability()
 
 
+@app.on_event("startup")
+async def _init_async_db():
+    """Open the shared async read connection."""
+    await db.init_aio()
+
+
+@app.on_event("startup")
+async def _start_cache_cleanup():
+    """Sweep expired cache rows periodically, off the request path.
+
+    Keeps the cache table small (the sweep is an index range scan on
+    the expiry index) without ever blocking a request on the DELETE.
+    """
+    async def _loop():
+        while True:
+            await asyncio.sleep(300)
+            await asyncio.to_thread(cache.cleanup_expired)
+
+    asyncio.create_task(_loop())
+
+
+@app.on_event("shutdown")
+async def _close_async_db():
+    """Close the shared async read connection and HTTP session."""
+    await db.close_aio()
+    await async_news_api.close()
+
+
+# Static part of the health-check payload, built once
+_STATUS_STATIC = {
+    "status": "ok",
+    "version": "1.0.0",
+    "environment": Config.ENVIRONMENT
+}
+
+
 # Health check
 @app.get("/status")
 async def status():
     """API health check."""
-    return {
-        "status": "ok",
-        "version": "1.0.0",
-        "timestamp": datetime.now().isoformat(),
-        "environment": Config.ENVIRONMENT
-    }
+    return {**_STATUS_STATIC, "timestamp": datetime.now().isoformat()}
 
 
 # Fetch upcoming matches
@@ -66,12 +104,22 @@ async def get_matches(league_id: int = Query(Config.DEFAULT_LEAGUE_ID),
                      days: int = Query(7)):
     """Get upcoming matches."""
     try:
-        matches = db.get_upcoming_matches(league_id, days)
-        return {
+        # Serve the pre-serialized bytes straight from the cache; on a
+        # hit nothing is decoded or re-encoded
+        raw_key = f"api_matches_{league_id}_{days}"
+        raw = cache.get_cache_raw(raw_key)
+        if raw:
+            return Response(content=raw, media_type="application/json")
+
+        # The DB layer already returns plain dicts; no second pass needed
+        matches = await db.aget_upcoming_matches(league_id, days)
+        payload = orjson.dumps({
             "success": True,
             "count": len(matches),
-            "data": [dict(m) for m in matches]
-        }
+            "data": matches
+        })
+        cache.set_cache_raw(raw_key, payload, 60)
+        return Response(content=payload, media_type="application/json")
     except Exception as e:
         logger.error(f"Failed to get matches: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -122,17 +170,52 @@ async def predict_upcoming(league_id: int = Query(Config.DEFAULT_LEAGUE_ID),
 async def get_predictions(match_id: int):
     """Get all predictions for a match."""
     try:
-        predictions = db.get_predictions(match_id)
+        predictions = await db.aget_predictions(match_id)
         return {
             "success": True,
             "count": len(predictions),
-            "data": [dict(p) for p in predictions]
+            "data": predictions
         }
     except Exception as e:
         logger.error(f"Failed to get predictions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Regenerate explanations
+@app.post("/api/explain")
+async def explain_matches(match_ids: List[int] = Query(...)):
+    """Regenerate explanations for the latest ensemble predictions."""
+    try:
+        items = []
+        for match_id in match_ids:
+            match = db.get_match(match_id)
+            if not match:
+                continue
+            predictions = await db.aget_predictions(match_id)
+            ensemble = next((p for p in predictions
+                             if p['model_type'] == 'ensemble'), None)
+            if ensemble:
+                items.append((match, ensemble))
+
+        # All LLM calls run concurrently; the request waits for the
+        # slowest one, not the sum
+        explanations = await explainability.explain_many(items)
+
+        data = {}
+        for (match, ensemble), explanation in zip(items, explanations):
+            db.update_prediction_explanation(match['id'], 'ensemble',
+                                             explanation)
+            data[match['id']] = explanation
+        return {
+            "success": True,
+            "count": len(data),
+            "data": data
+        }
+    except Exception as e:
+        logger.error(f"Failed to explain matches: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Backtest
 @app.post("/api/backtest")
 async def run_backtest(league_id: int = Query(Config.DEFAULT_LEAGUE_ID),
@@ -156,11 +239,11 @@ async def run_backtest(league_id: int = Query(Config.DEFAULT_LEAGUE_ID),
 async def get_metrics(model_type: str = Query(None)):
     """Get model performance metrics."""
     try:
-        metrics = db.get_model_metrics(model_type)
+        metrics = await db.aget_model_metrics(model_type)
         return {
             "success": True,
             "count": len(metrics),
-            "data": [dict(m) for m in metrics]
+            "data": metrics
         }
     except Exception as e:
         logger.error(f"Failed to get metrics: {e}")
@@ -172,7 +255,9 @@ async def get_metrics(model_type: str = Query(None)):
 async def get_team_news(team_name: str, days: int = Query(7)):
     """Get team news."""
     try:
-        news = news_api.get_team_news(team_name, days)
+        # The async client awaits the network hop instead of blocking
+        # the event loop; sentiment scoring is pure CPU and stays sync
+        news = await async_news_api.get_team_news(team_name, days)
         sentiment = news_api.analyze_sentiment(news or [])
         return {
             "success": True,
@@ -202,11 +287,9 @@ async def get_calibration(model_type: str,
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# Settings
-@app.get("/api/settings")
-async def get_settings():
-    """Get application settings."""
-    return {
+def _build_settings_bytes() -> bytes:
+    """Pre-serialize the settings response; it only changes on update."""
+    return orjson.dumps({
         "success": True,
         "data": {
             "default_league_id": Config.DEFAULT_LEAGUE_ID,
@@ -215,16 +298,28 @@ async def get_settings():
             "backtest_end": Config.BACKTEST_END_DATE,
             "environment": Config.ENVIRONMENT
         }
-    }
+    })
+
+
+_SETTINGS_BYTES = _build_settings_bytes()
+
+
+# Settings
+@app.get("/api/settings")
+async def get_settings():
+    """Get application settings."""
+    return Response(content=_SETTINGS_BYTES, media_type="application/json")
 
 
 @app.post("/api/settings")
 async def update_settings(settings: Dict):
     """Update application settings."""
+    global _SETTINGS_BYTES
     try:
         # Validate and update settings
         if "default_league_id" in settings:
             Config.DEFAULT_LEAGUE_ID = int(settings["default_league_id"])
+        _SETTINGS_BYTES = _build_settings_bytes()
         return {
             "success": True,
             "message": "Settings updated"
@@ -0,0 +1,21 @@
+"""Shared score-grid masks for the count models."""
+import functools
+import numpy as np
+
+# Both count models truncate the score grid here
+MAX_SCORE = 10
+
+
+@functools.lru_cache(maxsize=4)
+def outcome_masks(max_score: int = MAX_SCORE):
+    """Boolean home/away masks over the score grid, built once per size.
+
+    Home wins live below the diagonal, away wins above; draws are read
+    off the trace of the joint matrix so no draw mask is needed.
+    """
+    i, j = np.indices((max_score, max_score))
+    return i > j, i < j
+
+
+# Default-size masks, materialized at import
+HOME_MASK, AWAY_MASK = outcome_masks(MAX_SCORE)
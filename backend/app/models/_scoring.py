@@ -0,0 +1,73 @@
+"""Shared scoring kernels for the count models."""
+import functools
+import numpy as np
+from models._score_masks import outcome_masks
+
+try:
+    import numba
+except ImportError:  # numba is optional; the NumPy fallback serves instead
+    numba = None
+
+
+def _outcomes_loop(home_pmf: np.ndarray, away_pmf: np.ndarray):
+    """Home/draw/away mass of the joint score matrix, loop form for JIT."""
+    k = home_pmf.shape[0]
+    home_win = 0.0
+    draw = 0.0
+    away_win = 0.0
+    for i in range(k):
+        for j in range(k):
+            p = home_pmf[i] * away_pmf[j]
+            if i > j:
+                home_win += p
+            elif i == j:
+                draw += p
+            else:
+                away_win += p
+    return home_win, draw, away_win
+
+
+@functools.lru_cache(maxsize=8)
+def _outcomes_fixed(k: int):
+    """Compile a kernel with the matrix size baked in as a constant.
+
+    Closing over k makes it a compile-time constant for Numba, so LLVM
+    can fully unroll and vectorize the k*k sweep instead of carrying
+    runtime loop bounds. One compiled specialization is kept per size.
+    """
+    def kernel(home_pmf, away_pmf):
+        home_win = 0.0
+        draw = 0.0
+        away_win = 0.0
+        for i in range(k):
+            for j in range(k):
+                p = home_pmf[i] * away_pmf[j]
+                if i > j:
+                    home_win += p
+                elif i == j:
+                    draw += p
+                else:
+                    away_win += p
+        return home_win, draw, away_win
+    return numba.njit(fastmath=True)(kernel)
+
+
+if numba is not None:
+    def outcomes(home_pmf: np.ndarray, away_pmf: np.ndarray):
+        """Home/draw/away mass of the joint score matrix."""
+        return _outcomes_fixed(home_pmf.shape[0])(home_pmf, away_pmf)
+else:
+    def outcomes(home_pmf: np.ndarray, away_pmf: np.ndarray):
+        """Home/draw/away mass of the joint score matrix."""
+        joint = np.outer(home_pmf, away_pmf)
+        home_mask, away_mask = outcome_masks(home_pmf.shape[0])
+        return joint[home_mask].sum(), np.trace(joint), joint[away_mask].sum()
+
+
+def most_likely_score(home_pmf: np.ndarray, away_pmf: np.ndarray):
+    """Mode of the joint score matrix as (home_goals, away_goals).
+
+    The joint is a rank-one outer product, so its argmax factorizes
+    into the two marginal argmaxes — no matrix needed.
+    """
+    return int(np.argmax(home_pmf)), int(np.argmax(away_pmf))
@@ -1,10 +1,81 @@
 """Hawkes process model for self-exciting goal events."""
+import math
 import numpy as np
 from typing import Dict, List, Tuple
+from models.result import PredictionResult
 from logger import setup_logger
 
+try:
+    import numba
+except ImportError:  # numba is optional; the kernel runs as plain Python
+    numba = None
+
 logger = setup_logger(__name__)
 
+# PCG64 generator for the batched sampler: faster than the legacy
+# global Mersenne Twister and no per-call global-state locking. The
+# JIT kernel keeps numba's own nopython RNG.
+_rng = np.random.default_rng()
+
+
+def _simulate_goals_kernel(base_intensity: float, match_length: float,
+                           simulations: int, alpha: float,
+                           beta: float) -> np.ndarray:
+    """Ogata thinning kernel returning goal counts per simulation.
+
+    Written so Numba can compile it in nopython mode; the excitement
+    term decays between candidate events instead of being frozen at
+    exp(0), which the old loop got wrong.
+    """
+    counts = np.empty(simulations, dtype=np.int64)
+    for s in range(simulations):
+        t = 0.0
+        excitement = 0.0
+        n = 0
+        while True:
+            intensity = base_intensity + excitement
+            dt = -math.log(np.random.random()) / intensity
+            t += dt
+            if t >= match_length:
+                break
+            excitement *= math.exp(-beta * dt)
+            if np.random.random() < (base_intensity + excitement) / intensity:
+                n += 1
+                excitement += alpha
+        counts[s] = n
+    return counts
+
+
+if numba is not None:
+    _simulate_goals_kernel = numba.njit(cache=True)(_simulate_goals_kernel)
+
+
+def _simulate_goals_vec(base_intensity: float, match_length: float,
+                        simulations: int, alpha: float,
+                        beta: float) -> np.ndarray:
+    """Batched thinning sampler: all simulations in one NumPy pass.
+
+    Draws candidate events for every simulation at once under a
+    homogeneous dominating rate and thins them with a single uniform
+    compare. The Hawkes intensity is approximated by its stationary
+    mean base / (1 - alpha/beta), so the self-excitation shows up in
+    the rate rather than event-by-event; used when the JIT kernel is
+    unavailable.
+    """
+    lam_max = base_intensity * 2.0
+    branching = alpha / beta if beta > 0 else 0.0
+    mean_rate = base_intensity / max(1.0 - branching, 0.5)
+    mean_rate = min(mean_rate, lam_max)
+
+    n_per_sim = max(int(1.5 * lam_max * match_length) + 4, 8)
+    inter_arrivals = -np.log(
+        _rng.random((simulations, n_per_sim))) / lam_max
+    times = np.cumsum(inter_arrivals, axis=1)
+    accepted = ((times < match_length) &
+                (_rng.random((simulations, n_per_sim))
+                 < mean_rate / lam_max))
+    return accepted.sum(axis=1).astype(np.int64)
+
 
 class HawkesModel:
     """Hawkes process model for modeling self-exciting goal scoring patterns."""
@@ -18,9 +89,13 @@ class HawkesModel:
         self.beta = 1.0  # Decay rate
         self.max_score = 10
 
-    def fit(self, home_goals: List[float], away_goals: List[float], 
+    def fit(self, home_goals: np.ndarray, away_goals: np.ndarray,
             features: Dict = None):
-        """Fit Hawkes model using goal times."""
+        """Fit Hawkes model using goal counts.
+
+        Accepts arrays (or any sequence) directly — callers no longer
+        pay a tolist() round-trip just to satisfy the signature.
+        """
         try:
             # Simple parameter estimation
             if len(home_goals) > 0:
@@ -36,21 +111,31 @@ class HawkesModel:
         except Exception as e:
             logger.error(f"Failed to fit Hawkes model: {e}")
 
-    def intensity(self, t: float, goal_times: List[float], 
+    def intensity(self, t: float, goal_times: List[float],
                  base_intensity: float) -> float:
         """Calculate intensity at time t."""
-        try:
+        # Exception handling lives in the public predict; a bare except
+        # here just hid bad inputs and blocked compilation tooling
+        if goal_times is None or len(goal_times) == 0:
+            return base_intensity
+
+        # Few events is the common case: scalar math beats NumPy
+        # call overhead there, larger histories get one vectorized exp
+        if len(goal_times) < 4:
             intensity = base_intensity
             for goal_time in goal_times:
                 if goal_time < t:
-                    time_diff = t - goal_time
                     # Exponential kernel
-                    intensity += self.alpha * np.exp(-self.beta * time_diff)
+                    intensity += self.alpha * math.exp(
+                        -self.beta * (t - goal_time))
             return intensity
-        except:
-            return base_intensity
 
-    def predict(self, features: Dict = None, match_length: float = 90.0) -> Dict:
+        times = np.asarray(goal_times)
+        dt = t - times[times < t]
+        return base_intensity + self.alpha * np.exp(-self.beta * dt).sum()
+
+    def predict(self, features: Dict = None,
+                match_length: float = 90.0) -> PredictionResult:
         """Predict goals using Hawkes process intensity."""
         try:
             # Simulate goal events
@@ -90,54 +175,48 @@ class HawkesModel:
                 draw_prob /= total_prob
                 away_prob /= total_prob
             
-            predicted_score = f"{num_home_goals}-{num_away_goals}"
-            
-            return {
-                "home_probability": float(home_prob),
-                "draw_probability": float(draw_prob),
-                "away_probability": float(away_prob),
-                "predicted_score": predicted_score,
-                "home_goals": num_home_goals,
-                "away_goals": num_away_goals
-            }
+            return PredictionResult(
+                home_probability=float(home_prob),
+                draw_probability=float(draw_prob),
+                away_probability=float(away_prob),
+                predicted_score=f"{num_home_goals}-{num_away_goals}",
+                home_goals=num_home_goals,
+                away_goals=num_away_goals
+            )
         except Exception as e:
             logger.error(f"Hawkes prediction failed: {e}")
             return self._get_default_prediction()
 
     def _simulate_goals(self, base_intensity: float, 
                        match_length: float, simulations: int = 100) -> np.ndarray:
-        """Simulate goal times using Hawkes process."""
-        try:
-            goal_counts = []
-            for _ in range(simulations):
-                goals = []
-                t = 0
-                intensity = base_intensity
-                
-                while t < match_length:
-                    # Generate next event time
-                    dt = -np.log(np.random.uniform()) / intensity
-                    t += dt
-                    
-                    if t < match_length:
-                        # Accept/reject based on thinning
-                        if np.random.uniform() < intensity / (base_intensity * 2):
-                            goals.append(t)
-                            intensity = base_intensity + self.alpha * np.exp(-self.beta * 0)
-                
-                goal_counts.append(len(goals))
-            
-            return np.array(goal_counts)
-        except:
-            return np.array([np.random.poisson(base_intensity * match_length / 90.0)])
+        """Simulate goal counts using Hawkes process thinning."""
+        # No try/except here: the kernels are exception-free and the
+        # public predict handles failures
+        if numba is None:
+            return _simulate_goals_vec(
+                float(base_intensity), float(match_length),
+                int(simulations), float(self.alpha), float(self.beta)
+            )
+        return _simulate_goals_kernel(
+            float(base_intensity), float(match_length),
+            int(simulations), float(self.alpha), float(self.beta)
+        )
 
-    def _get_default_prediction(self) -> Dict:
+    def _get_default_prediction(self) -> PredictionResult:
         """Return default prediction."""
-        return {
-            "home_probability": 0.35,
-            "draw_probability": 0.32,
-            "away_probability": 0.33,
-            "predicted_score": "1-1",
-            "home_goals": 1,
-            "away_goals": 1
-        }
+        return PredictionResult(
+            home_probability=0.35,
+            draw_probability=0.32,
+            away_probability=0.33,
+            predicted_score="1-1",
+            home_goals=1,
+            away_goals=1
+        )
+
+
+def fit_predict(home_goals: np.ndarray, away_goals: np.ndarray,
+                features: Dict = None) -> PredictionResult:
+    """Fit a fresh Hawkes model and predict in one call."""
+    model = HawkesModel()
+    model.fit(home_goals, away_goals, features)
+    return model.predict(features)
@@ -5,6 +5,10 @@ from logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Form thresholds for state mapping; digitize against these replaces
+# the per-value if/elif chain
+_FORM_BINS = np.array([0.35, 0.65])
+
 
 class HMMFormModel:
     """Hidden Markov Model for capturing team form states."""
@@ -23,6 +27,21 @@ class HMMFormModel:
             [0.1, 0.3, 0.6]     # Poor form: high loss prob
         ])
         self.state_probs = np.array([0.33, 0.33, 0.34])  # Initial state distribution
+        self._rebuild_outcome_table()
+
+    def _rebuild_outcome_table(self):
+        """Precompute normalized outcome probs for all nine state pairs.
+
+        There are only 3x3 state combinations, so the emission algebra
+        and its normalization collapse into one table lookup per
+        prediction. Call again if emission_probs ever change.
+        """
+        emissions = self.emission_probs
+        home = emissions[:, None, 0] * (1 - emissions[None, :, 2])
+        away = emissions[None, :, 2] * (1 - emissions[:, None, 0])
+        draw = 1.0 - home - away
+        table = np.stack([home, draw, away], axis=-1)
+        self._outcome_table = table / table.sum(axis=-1, keepdims=True)
 
     def fit(self, results: np.ndarray):
         """Fit HMM parameters using historical results."""
@@ -45,41 +64,48 @@ class HMMFormModel:
         except Exception as e:
             logger.error(f"Failed to fit HMM: {e}")
 
+    def predict_batch(self, home_forms: np.ndarray,
+                      away_forms: np.ndarray) -> Tuple:
+        """Vectorized prediction over arrays of form values.
+
+        States come from one digitize call and the outcome probabilities
+        from one gather on the precomputed state-pair table, so scoring
+        N matches costs a handful of array ops instead of N interpreted
+        branches.
+        """
+        home_states = 2 - np.digitize(home_forms, _FORM_BINS, right=True)
+        away_states = 2 - np.digitize(away_forms, _FORM_BINS, right=True)
+
+        probs = self._outcome_table[home_states, away_states]
+        return (probs[:, 0], probs[:, 1], probs[:, 2],
+                home_states, away_states)
+
     def predict(self, features: Dict = None) -> Dict:
         """Predict using HMM."""
         try:
             # Current state based on form
             home_form = features.get('home_form', 0.5) if features else 0.5
             away_form = features.get('away_form', 0.5) if features else 0.5
-            
-            # Map form to state
-            home_state = self._get_state_from_form(home_form)
-            away_state = self._get_state_from_form(away_form)
-            
-            # Get emission probabilities
-            home_emissions = self.emission_probs[home_state]
-            away_emissions = self.emission_probs[away_state]
-            
-            # Combine probabilities
-            home_prob = home_emissions[0] * (1 - away_emissions[2])
-            away_prob = away_emissions[2] * (1 - home_emissions[0])
-            draw_prob = 1.0 - home_prob - away_prob
-            
-            # Normalize
-            total = home_prob + draw_prob + away_prob
-            if total > 0:
-                home_prob /= total
-                draw_prob /= total
-                away_prob /= total
-            
+
+            home_probs, draw_probs, away_probs, home_states, away_states = \
+                self.predict_batch(np.array([home_form]),
+                                   np.array([away_form]))
+            home_prob = home_probs[0]
+            draw_prob = draw_probs[0]
+            away_prob = away_probs[0]
+            home_state = int(home_states[0])
+            away_state = int(away_states[0])
+
             # Predict score
-            predicted_score = self._predict_score(home_state, away_state)
-            
+            home_goals, away_goals = self._predict_goals(home_state, away_state)
+
             return {
                 "home_probability": float(home_prob),
                 "draw_probability": float(draw_prob),
                 "away_probability": float(away_prob),
-                "predicted_score": predicted_score,
+                "predicted_score": f"{home_goals}-{away_goals}",
+                "home_goals": home_goals,
+                "away_goals": away_goals,
                 "home_state": home_state,
                 "away_state": away_state
             }
@@ -96,16 +122,13 @@ class HMMFormModel:
         else:
             return 2  # Poor form
 
-    def _predict_score(self, home_state: int, away_state: int) -> str:
-        """Predict score based on states."""
-        state_names = ["Good", "Medium", "Poor"]
-        
+    def _predict_goals(self, home_state: int, away_state: int) -> Tuple[int, int]:
+        """Predict integer goals based on states."""
         # Base goals by state
         state_goals = [1.8, 1.3, 0.8]
         home_goals = int(round(state_goals[home_state]))
         away_goals = int(round(state_goals[away_state]))
-        
-        return f"{home_goals}-{away_goals}"
+        return home_goals, away_goals
 
     def _get_default_prediction(self) -> Dict:
         """Return default prediction."""
@@ -114,6 +137,15 @@ class HMMFormModel:
             "draw_probability": 0.34,
             "away_probability": 0.33,
             "predicted_score": "1-1",
+            "home_goals": 1,
+            "away_goals": 1,
             "home_state": 1,
             "away_state": 1
         }
+
+
+def fit_predict(results: np.ndarray, features: Dict = None) -> Dict:
+    """Fit a fresh HMM on recent results and predict in one call."""
+    model = HMMFormModel()
+    model.fit(results)
+    return model.predict(features)
@@ -1,6 +1,7 @@
 """Mixture of Experts model ensemble."""
 import numpy as np
 from typing import Dict, List
+from models.result import PredictionResult
 from logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -9,6 +10,9 @@ logger = setup_logger(__name__)
 class MixtureOfExpertsModel:
     """Ensemble model combining multiple expert predictions with learned weights."""
 
+    # Fixed expert ordering backing the weights vector
+    _model_order = ('poisson', 'negative_binomial', 'hawkes', 'hmm')
+
     def __init__(self):
         """Initialize MoE."""
         # Weights for each model (learned from backtesting)
@@ -19,6 +23,12 @@ class MixtureOfExpertsModel:
             'hmm': 0.25
         }
         self.model_performances = {}
+        self._rebuild_weights_vec()
+
+    def _rebuild_weights_vec(self):
+        """Mirror the weights dict into an ordered vector for predict."""
+        self._weights_vec = np.array(
+            [self.weights.get(m, 0.0) for m in self._model_order])
 
     def fit_weights(self, model_performances: Dict[str, float]):
         """Learn weights based on model performance."""
@@ -29,57 +39,54 @@ class MixtureOfExpertsModel:
                 for model, perf in model_performances.items():
                     self.weights[model] = perf / total_perf
             self.model_performances = model_performances
+            self._rebuild_weights_vec()
         except Exception as e:
             logger.error(f"Failed to fit MoE weights: {e}")
 
-    def predict(self, predictions: Dict[str, Dict]) -> Dict:
+    def predict(self, predictions: Dict[str, Dict]) -> PredictionResult:
         """Combine predictions from multiple models."""
         try:
-            weighted_home = 0.0
-            weighted_draw = 0.0
-            weighted_away = 0.0
-            
-            # Weight each prediction
-            for model_type, weight in self.weights.items():
-                if model_type in predictions:
-                    pred = predictions[model_type]
-                    weighted_home += weight * pred.get('home_probability', 0)
-                    weighted_draw += weight * pred.get('draw_probability', 0)
-                    weighted_away += weight * pred.get('away_probability', 0)
-            
+            # One pass gathers every expert into a stacked probs array;
+            # the combine is then a single weights @ probs dot product
+            # and confidences fall out of the same array
+            probs = np.zeros((len(self._model_order), 3))
+            confidences = []
+            for row, model in enumerate(self._model_order):
+                pred = predictions.get(model)
+                if not pred:
+                    continue
+                probs[row] = (pred.get('home_probability', 0),
+                              pred.get('draw_probability', 0),
+                              pred.get('away_probability', 0))
+                conf = pred.get('confidence', None)
+                if conf is None:
+                    # Infer confidence from max probability
+                    conf = probs[row].max()
+                confidences.append(conf)
+            weighted_home, weighted_draw, weighted_away = \
+                self._weights_vec @ probs
+
             # Normalize
             total = weighted_home + weighted_draw + weighted_away
             if total > 0:
                 weighted_home /= total
                 weighted_draw /= total
                 weighted_away /= total
-            
+
             # Combine predicted scores
             predicted_score = self._combine_scores(predictions)
-            
-            # Calculate confidence as average of model confidences
-            confidences = []
-            for pred in predictions.values():
-                if 'confidence' in pred:
-                    confidences.append(pred['confidence'])
-                else:
-                    # Infer confidence from max probability
-                    max_prob = max(pred.get('home_probability', 0),
-                                 pred.get('draw_probability', 0),
-                                 pred.get('away_probability', 0))
-                    confidences.append(max_prob)
-            
+
             confidence = np.mean(confidences) if confidences else 0.5
-            
-            return {
-                "home_probability": float(weighted_home),
-                "draw_probability": float(weighted_draw),
-                "away_probability": float(weighted_away),
-                "predicted_score": predicted_score,
-                "confidence": float(confidence),
-                "weights": self.weights,
-                "ensemble_type": "mixture_of_experts"
-            }
+
+            return PredictionResult(
+                home_probability=float(weighted_home),
+                draw_probability=float(weighted_draw),
+                away_probability=float(weighted_away),
+                predicted_score=predicted_score,
+                confidence=float(confidence),
+                weights=self.weights,
+                ensemble_type="mixture_of_experts"
+            )
         except Exception as e:
             logger.error(f"MoE prediction failed: {e}")
             return self._get_default_prediction()
@@ -87,10 +94,22 @@ class MixtureOfExpertsModel:
     def _combine_scores(self, predictions: Dict[str, Dict]) -> str:
         """Combine predicted scores from multiple models."""
         try:
+            # Models report structured integer goals; average those
+            # directly instead of re-parsing the score strings
+            preds = list(predictions.values())
+            home_goals = [p.get('home_goals', None) for p in preds]
+            away_goals = [p.get('away_goals', None) for p in preds]
+            if preds and None not in home_goals and None not in away_goals:
+                home = np.fromiter(home_goals, dtype=np.int32,
+                                   count=len(preds))
+                away = np.fromiter(away_goals, dtype=np.int32,
+                                   count=len(preds))
+                return f"{int(round(home.mean()))}-{int(round(away.mean()))}"
+
+            # Legacy dicts without goal fields: parse the strings
             home_scores = []
             away_scores = []
-            
-            for pred in predictions.values():
+            for pred in preds:
                 score_str = pred.get('predicted_score', '1-1')
                 parts = score_str.split('-')
                 if len(parts) == 2:
@@ -99,25 +118,25 @@ class MixtureOfExpertsModel:
                         away_scores.append(int(parts[1]))
                     except ValueError:
                         pass
-            
+
             if home_scores and away_scores:
                 avg_home = round(np.mean(home_scores))
                 avg_away = round(np.mean(away_scores))
                 return f"{avg_home}-{avg_away}"
-            
+
             return "1-1"
         except Exception as e:
             logger.error(f"Failed to combine scores: {e}")
             return "1-1"
 
-    def _get_default_prediction(self) -> Dict:
+    def _get_default_prediction(self) -> PredictionResult:
         """Return default prediction."""
-        return {
-            "home_probability": 0.33,
-            "draw_probability": 0.34,
-            "away_probability": 0.33,
-            "predicted_score": "1-1",
-            "confidence": 0.5,
-            "weights": self.weights,
-            "ensemble_type": "mixture_of_experts"
-        }
+        return PredictionResult(
+            home_probability=0.33,
+            draw_probability=0.34,
+            away_probability=0.33,
+            predicted_score="1-1",
+            confidence=0.5,
+            weights=self.weights,
+            ensemble_type="mixture_of_experts"
+        )
@@ -1,12 +1,63 @@
 """Negative Binomial model for football prediction with overdispersion."""
+import math
 import numpy as np
-from scipy import stats
-from typing import Dict
+import functools
+from typing import Dict, List
+from models._scoring import outcomes, most_likely_score
+from models.poisson import _pmf_tables, _batch_outcomes
 from logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
+@functools.lru_cache(maxsize=64)
+def _lgamma_table(alpha: float, max_score: int) -> np.ndarray:
+    """lgamma(k + alpha) for k = 0..max_score-1, cached per alpha.
+
+    Ten math.lgamma calls replace scipy.special.gammaln, keeping scipy
+    out of the model import path entirely.
+    """
+    return np.array([math.lgamma(k + alpha) for k in range(max_score)])
+
+
+def _nbinom_pmf(mu: float, alpha: float, max_score: int) -> np.ndarray:
+    """Truncated negative binomial PMF in log space.
+
+    Same idea as the Poisson table: skip scipy.stats dispatch and
+    evaluate the closed form directly, renormalizing the tail away.
+    """
+    k, log_fact = _pmf_tables(max_score)
+    p = alpha / (alpha + mu)
+    log_pmf = (_lgamma_table(alpha, max_score) - math.lgamma(alpha)
+               - log_fact + alpha * math.log(p) + k * math.log1p(-p))
+    probs = np.exp(log_pmf)
+    return probs / probs.sum()
+
+
+@functools.lru_cache(maxsize=1024)
+def _nbinom_outcomes(home_mu_q: float, home_alpha_q: float,
+                     away_mu_q: float, away_alpha_q: float, max_score: int):
+    """Cached outcome reduction on quantized (mu, alpha) pairs."""
+    home_pmf = _nbinom_pmf(home_mu_q, home_alpha_q, max_score)
+    away_pmf = _nbinom_pmf(away_mu_q, away_alpha_q, max_score)
+    home_win, draw, away_win = outcomes(home_pmf, away_pmf)
+    home_goals, away_goals = most_likely_score(home_pmf, away_pmf)
+    return home_win, draw, away_win, home_goals, away_goals
+
+
+def _nbinom_pmf_rows(mus: np.ndarray, alpha: float,
+                     max_score: int) -> np.ndarray:
+    """Truncated negative binomial PMF rows for a vector of means."""
+    k, log_fact = _pmf_tables(max_score)
+    p = alpha / (alpha + mus)
+    log_pmf = (_lgamma_table(alpha, max_score)[None, :] - math.lgamma(alpha)
+               - log_fact[None, :]
+               + alpha * np.log(p)[:, None]
+               + k[None, :] * np.log1p(-p)[:, None])
+    rows = np.exp(log_pmf)
+    return rows / rows.sum(axis=1, keepdims=True)
+
+
 class NegativeBinomialModel:
     """Negative Binomial model handling overdispersion in goal data."""
 
@@ -65,36 +116,13 @@ class NegativeBinomialModel:
                 home_mu *= (0.5 + home_form)
                 away_mu *= (0.5 + away_form)
             
-            # Calculate probabilities for each possible score
-            home_scores = np.arange(0, self.max_score)
-            away_scores = np.arange(0, self.max_score)
-            
-            home_probs = stats.nbinom.pmf(
-                home_scores, 
-                home_alpha, 
-                home_alpha / (home_alpha + home_mu)
-            )
-            away_probs = stats.nbinom.pmf(
-                away_scores,
-                away_alpha,
-                away_alpha / (away_alpha + away_mu)
-            )
-            
-            # Calculate match outcome probabilities
-            home_win = 0.0
-            draw = 0.0
-            away_win = 0.0
-            
-            for i, home_score in enumerate(home_scores):
-                for j, away_score in enumerate(away_scores):
-                    prob = home_probs[i] * away_probs[j]
-                    if home_score > away_score:
-                        home_win += prob
-                    elif home_score == away_score:
-                        draw += prob
-                    else:
-                        away_win += prob
-            
+            # Same joint-matrix reduction as the Poisson model, cached
+            # on the quantized parameters
+            home_win, draw, away_win, home_goals, away_goals = \
+                _nbinom_outcomes(
+                    round(home_mu, 4), round(home_alpha, 4),
+                    round(away_mu, 4), round(away_alpha, 4), self.max_score)
+
             # Normalize
             total = home_win + draw + away_win
             if total > 0:
@@ -102,14 +130,13 @@ class NegativeBinomialModel:
                 draw /= total
                 away_win /= total
             
-            # Most likely score
-            predicted_score = self._get_most_likely_score(home_mu, away_mu)
-            
             return {
                 "home_probability": float(home_win),
                 "draw_probability": float(draw),
                 "away_probability": float(away_win),
-                "predicted_score": predicted_score,
+                "predicted_score": f"{home_goals}-{away_goals}",
+                "home_goals": home_goals,
+                "away_goals": away_goals,
                 "home_mu": float(home_mu),
                 "away_mu": float(away_mu),
                 "home_alpha": float(home_alpha),
@@ -119,11 +146,25 @@ class NegativeBinomialModel:
             logger.error(f"NB prediction failed: {e}")
             return self._get_default_prediction()
 
-    def _get_most_likely_score(self, home_mu: float, away_mu: float) -> str:
-        """Get most likely score."""
-        home_score = int(round(home_mu))
-        away_score = int(round(away_mu))
-        return f"{home_score}-{away_score}"
+    def predict_many(self, features_list: List[Dict]) -> Dict[str, np.ndarray]:
+        """Score many matches in one pass, returning column arrays."""
+        home_forms = np.array([f.get('home_form', 0.5) if f else 0.5
+                               for f in features_list])
+        away_forms = np.array([f.get('away_form', 0.5) if f else 0.5
+                               for f in features_list])
+        home_mus = self.home_mu * (0.5 + home_forms)
+        away_mus = self.away_mu * (0.5 + away_forms)
+
+        home_rows = _nbinom_pmf_rows(home_mus, self.home_alpha, self.max_score)
+        away_rows = _nbinom_pmf_rows(away_mus, self.away_alpha, self.max_score)
+        probs = _batch_outcomes(home_rows, away_rows)
+        return {
+            "home_probability": probs[:, 0],
+            "draw_probability": probs[:, 1],
+            "away_probability": probs[:, 2],
+            "home_goals": np.argmax(home_rows, axis=1),
+            "away_goals": np.argmax(away_rows, axis=1),
+        }
 
     def _get_default_prediction(self) -> Dict:
         """Return default prediction."""
@@ -132,8 +173,18 @@ class NegativeBinomialModel:
             "draw_probability": 0.34,
             "away_probability": 0.33,
             "predicted_score": "1-1",
+            "home_goals": 1,
+            "away_goals": 1,
             "home_mu": 1.5,
             "away_mu": 1.2,
             "home_alpha": 1.0,
             "away_alpha": 1.0
         }
+
+
+def fit_predict(home_goals: np.ndarray, away_goals: np.ndarray,
+                features: Dict = None) -> Dict:
+    """Fit a fresh Negative Binomial model and predict in one call."""
+    model = NegativeBinomialModel()
+    model.fit(home_goals, away_goals, features)
+    return model.predict(features)
@@ -1,12 +1,139 @@
 """Poisson model for football score prediction."""
+import functools
+import math
 import numpy as np
-from scipy import stats
-from typing import Tuple, Dict
+from typing import Dict, List
+from models._scoring import outcomes, most_likely_score
 from logger import setup_logger
 
+try:
+    import numba
+    _prange = numba.prange
+except ImportError:  # numba is optional; the kernel runs as plain Python
+    numba = None
+    _prange = range
+
 logger = setup_logger(__name__)
 
 
+def _batch_outcomes_kernel(home_pmfs: np.ndarray,
+                           away_pmfs: np.ndarray) -> np.ndarray:
+    """Reduce (N, K) PMF rows to (N, 3) outcome probabilities.
+
+    Written so Numba can compile it with parallel=True; each match is
+    independent, so the outer loop spreads across cores.
+    """
+    n, k = home_pmfs.shape
+    out = np.empty((n, 3))
+    for m in _prange(n):
+        home_win = 0.0
+        draw = 0.0
+        away_win = 0.0
+        for i in range(k):
+            for j in range(k):
+                p = home_pmfs[m, i] * away_pmfs[m, j]
+                if i > j:
+                    home_win += p
+                elif i == j:
+                    draw += p
+                else:
+                    away_win += p
+        total = home_win + draw + away_win
+        out[m, 0] = home_win / total
+        out[m, 1] = draw / total
+        out[m, 2] = away_win / total
+    return out
+
+
+if numba is not None:
+    _batch_outcomes_kernel = numba.njit(
+        parallel=True, cache=True)(_batch_outcomes_kernel)
+
+
+def _batch_outcomes_10(home_pmfs: np.ndarray,
+                       away_pmfs: np.ndarray) -> np.ndarray:
+    """Fixed-size variant of the batch reduction for the default grid.
+
+    The literal 10-wide loops let LLVM fully unroll and vectorize the
+    scan under Numba's fastmath; max_score never varies in practice.
+    """
+    n = home_pmfs.shape[0]
+    out = np.empty((n, 3))
+    for m in _prange(n):
+        home_win = 0.0
+        draw = 0.0
+        away_win = 0.0
+        for i in range(10):
+            for j in range(10):
+                p = home_pmfs[m, i] * away_pmfs[m, j]
+                if i > j:
+                    home_win += p
+                elif i == j:
+                    draw += p
+                else:
+                    away_win += p
+        total = home_win + draw + away_win
+        out[m, 0] = home_win / total
+        out[m, 1] = draw / total
+        out[m, 2] = away_win / total
+    return out
+
+
+if numba is not None:
+    _batch_outcomes_10 = numba.njit(
+        parallel=True, cache=True, fastmath=True)(_batch_outcomes_10)
+
+
+def _batch_outcomes(home_pmfs: np.ndarray,
+                    away_pmfs: np.ndarray) -> np.ndarray:
+    """Dispatch to the specialized kernel on the default grid size."""
+    if home_pmfs.shape[1] == 10:
+        return _batch_outcomes_10(home_pmfs, away_pmfs)
+    return _batch_outcomes_kernel(home_pmfs, away_pmfs)
+
+
+def _poisson_pmf_rows(lams: np.ndarray, max_score: int) -> np.ndarray:
+    """Truncated Poisson PMF rows for a vector of rates."""
+    k, log_fact = _pmf_tables(max_score)
+    rows = np.exp(k[None, :] * np.log(lams)[:, None]
+                  - lams[:, None] - log_fact[None, :])
+    return rows / rows.sum(axis=1, keepdims=True)
+
+
+@functools.lru_cache(maxsize=4)
+def _pmf_tables(max_score: int):
+    """Score vector and log-factorial table, built once per grid size."""
+    k = np.arange(max_score)
+    log_fact = np.array([math.lgamma(i + 1.0) for i in range(max_score)])
+    return k, log_fact
+
+
+def _poisson_pmf(lam: float, max_score: int) -> np.ndarray:
+    """Truncated Poisson PMF via the log-factorial table.
+
+    scipy.stats.poisson.pmf spends ~100us on validation and broadcast
+    machinery to evaluate ten points; this is three array ops.
+    Renormalizing absorbs the truncated tail.
+    """
+    k, log_fact = _pmf_tables(max_score)
+    probs = np.exp(k * math.log(lam) - lam - log_fact)
+    return probs / probs.sum()
+
+
+@functools.lru_cache(maxsize=1024)
+def _poisson_outcomes(home_q: float, away_q: float, max_score: int):
+    """Outcome reduction for quantized rates, cached across calls.
+
+    The ensemble re-predicts the same parameter pairs constantly;
+    keying on rates rounded to 4 decimals makes repeats a dict hit.
+    """
+    home_pmf = _poisson_pmf(home_q, max_score)
+    away_pmf = _poisson_pmf(away_q, max_score)
+    home_win, draw, away_win = outcomes(home_pmf, away_pmf)
+    home_goals, away_goals = most_likely_score(home_pmf, away_pmf)
+    return home_win, draw, away_win, home_goals, away_goals
+
+
 class PoissonModel:
     """Poisson regression model for goal prediction."""
 
@@ -49,28 +176,13 @@ class PoissonModel:
                 home_lambda *= (0.5 + home_form)
                 away_lambda *= (0.5 + away_form)
             
-            # Calculate probabilities for each possible score
-            home_scores = np.arange(0, self.max_score)
-            away_scores = np.arange(0, self.max_score)
-            
-            home_probs = stats.poisson.pmf(home_scores, home_lambda)
-            away_probs = stats.poisson.pmf(away_scores, away_lambda)
-            
-            # Calculate match outcome probabilities
-            home_win = 0.0
-            draw = 0.0
-            away_win = 0.0
-            
-            for i, home_score in enumerate(home_scores):
-                for j, away_score in enumerate(away_scores):
-                    prob = home_probs[i] * away_probs[j]
-                    if home_score > away_score:
-                        home_win += prob
-                    elif home_score == away_score:
-                        draw += prob
-                    else:
-                        away_win += prob
-            
+            # Joint score matrix plus three reductions replaces the
+            # max_score^2 Python loop over score pairs; the reduction
+            # itself is cached on the quantized rates
+            home_win, draw, away_win, home_goals, away_goals = \
+                _poisson_outcomes(round(home_lambda, 4),
+                                  round(away_lambda, 4), self.max_score)
+
             # Normalize
             total = home_win + draw + away_win
             if total > 0:
@@ -78,14 +190,13 @@ class PoissonModel:
                 draw /= total
                 away_win /= total
             
-            # Find most likely score
-            predicted_score = self._get_most_likely_score(home_lambda, away_lambda)
-            
             return {
                 "home_probability": float(home_win),
                 "draw_probability": float(draw),
                 "away_probability": float(away_win),
-                "predicted_score": predicted_score,
+                "predicted_score": f"{home_goals}-{away_goals}",
+                "home_goals": home_goals,
+                "away_goals": away_goals,
                 "home_lambda": float(home_lambda),
                 "away_lambda": float(away_lambda)
             }
@@ -93,11 +204,30 @@ class PoissonModel:
             logger.error(f"Prediction failed: {e}")
             return self._get_default_prediction()
 
-    def _get_most_likely_score(self, home_lambda: float, away_lambda: float) -> str:
-        """Get most likely score."""
-        home_score = int(round(home_lambda))
-        away_score = int(round(away_lambda))
-        return f"{home_score}-{away_score}"
+    def predict_many(self, features_list: List[Dict]) -> Dict[str, np.ndarray]:
+        """Score many matches in one pass, returning column arrays.
+
+        Builds the rate vectors and PMF rows with NumPy and reduces
+        them in the shared batch kernel, so league-wide scoring never
+        loops over matches in the interpreter.
+        """
+        home_forms = np.array([f.get('home_form', 0.5) if f else 0.5
+                               for f in features_list])
+        away_forms = np.array([f.get('away_form', 0.5) if f else 0.5
+                               for f in features_list])
+        home_lams = self.home_lambda * (0.5 + home_forms)
+        away_lams = self.away_lambda * (0.5 + away_forms)
+
+        home_rows = _poisson_pmf_rows(home_lams, self.max_score)
+        away_rows = _poisson_pmf_rows(away_lams, self.max_score)
+        probs = _batch_outcomes(home_rows, away_rows)
+        return {
+            "home_probability": probs[:, 0],
+            "draw_probability": probs[:, 1],
+            "away_probability": probs[:, 2],
+            "home_goals": np.argmax(home_rows, axis=1),
+            "away_goals": np.argmax(away_rows, axis=1),
+        }
 
     def _get_default_prediction(self) -> Dict:
         """Return default prediction."""
@@ -106,6 +236,21 @@ class PoissonModel:
             "draw_probability": 0.34,
             "away_probability": 0.33,
             "predicted_score": "1-1",
+            "home_goals": 1,
+            "away_goals": 1,
             "home_lambda": 1.5,
             "away_lambda": 1.2
         }
+
+
+def fit_predict(home_goals: np.ndarray, away_goals: np.ndarray,
+                features: Dict = None) -> Dict:
+    """Fit a fresh Poisson model and predict in one call.
+
+    Stateless entry point for callers that run models concurrently:
+    no shared instance to race on, and the heavy tables (PMF caches,
+    compiled kernels) already live at module scope.
+    """
+    model = PoissonModel()
+    model.fit(home_goals, away_goals, features)
+    return model.predict(features)
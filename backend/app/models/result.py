@@ -0,0 +1,25 @@
+"""Lightweight prediction result type for the models."""
+from typing import Any, Dict, NamedTuple
+
+
+class PredictionResult(NamedTuple):
+    """Slotted prediction result; one allocation, C-level field access.
+
+    Replaces the string-keyed dicts on the hottest producers. Fields a
+    model does not set stay None and fall back to the caller's default
+    through get().
+    """
+    home_probability: float
+    draw_probability: float
+    away_probability: float
+    predicted_score: str
+    home_goals: int = 1
+    away_goals: int = 1
+    confidence: float = None
+    weights: Dict = None
+    ensemble_type: str = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style lookup for call sites that still expect mappings."""
+        value = getattr(self, key, None)
+        return default if value is None else value
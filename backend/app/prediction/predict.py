@@ -1,21 +1,79 @@
 """Main prediction pipeline."""
+import os
+import queue
+import threading
 import numpy as np
+from concurrent.futures import (ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed)
 from typing import Dict, List, Optional
 from datetime import datetime
-from database import Database
-from cache import Cache
+from database import Database, get_shared_database
+from cache import Cache, get_shared_cache
 from api_clients.football_api import FootballAPIClient
 from api_clients.news_api import NewsAPIClient
 from api_clients.llm_api import LLMAPIClient
-from models.poisson import PoissonModel
-from models.negative_binomial import NegativeBinomialModel
-from models.hawkes import HawkesModel
-from models.hmm import HMMFormModel
+from models import poisson, negative_binomial, hawkes, hmm
 from models.mixture_expert import MixtureOfExpertsModel
 from logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Fallback history queries as module constants: execute() then always
+# sees the identical string and reuses the connection's cached
+# prepared statement instead of re-parsing per match
+_SQL_HOME_GOALS = """
+    SELECT COALESCE(home_score, 0) FROM matches
+    WHERE home_team_id = ? AND league_id = ? AND home_score IS NOT NULL
+    ORDER BY match_date DESC LIMIT ?
+"""
+
+_SQL_AWAY_GOALS = """
+    SELECT COALESCE(away_score, 0) FROM matches
+    WHERE away_team_id = ? AND league_id = ? AND away_score IS NOT NULL
+    ORDER BY match_date DESC LIMIT ?
+"""
+
+_SQL_TEAM_RESULTS = """
+    SELECT home_score, away_score FROM matches
+    WHERE (home_team_id = ? OR away_team_id = ?)
+    AND league_id = ? AND home_score IS NOT NULL
+    ORDER BY match_date DESC LIMIT ?
+"""
+
+# Per-process pipeline for the predict_upcoming worker pool; built
+# lazily in the pool initializer so each worker owns its own SQLite
+# connection and caches
+_worker_pipeline = None
+
+
+def _init_worker():
+    """Initializer for predict_upcoming worker processes."""
+    global _worker_pipeline
+    # A forked child inherits the parent's shared Cache/Database and
+    # their open SQLite handles, and SQLite forbids carrying a
+    # connection across fork(). Drop the inherited handles without
+    # closing them (they belong to the parent) and clear the
+    # singletons so everything the pipeline touches reopens here.
+    if get_shared_cache.cache_info().currsize:
+        get_shared_cache().db.discard_connections()
+        get_shared_cache.cache_clear()
+    if get_shared_database.cache_info().currsize:
+        get_shared_database().discard_connections()
+        get_shared_database.cache_clear()
+    _worker_pipeline = PredictionPipeline()
+
+
+def _predict_match_worker(match_id: int, league_id: int, use_news: bool,
+                          match_data: Dict) -> Optional[Dict]:
+    """Run one match prediction on the worker-local pipeline.
+
+    Explanations are deferred: the parent batches them into one LLM
+    call for the whole window after the pool joins.
+    """
+    return _worker_pipeline.predict_match(match_id, league_id, use_news,
+                                          match_data,
+                                          defer_explanation=True)
+
 
 class PredictionPipeline:
     """Main prediction pipeline orchestrating all models and data sources."""
@@ -28,19 +86,53 @@ class PredictionPipeline:
         self.news_api = NewsAPIClient()
         self.llm_api = LLMAPIClient()
         
-        # Initialize models
-        self.poisson = PoissonModel()
-        self.nb = NegativeBinomialModel()
-        self.hawkes = HawkesModel()
-        self.hmm = HMMFormModel()
+        # Expert models are request-local (see _fit_predict_models);
+        # only the ensemble keeps state across matches for its weights
         self.moe = MixtureOfExpertsModel()
 
+        # Background pool for the LLM explanation; one slow round-trip
+        # per match must not sit on the prediction critical path
+        self._explain_executor = ThreadPoolExecutor(max_workers=2)
+
+        # Count of news fetches skipped for stat-less teams
+        self._news_skips = 0
+
+        # Per-run prefetches, filled by predict_upcoming so the
+        # per-match helpers skip their own queries
+        self._hist_cache = {}
+        self._stats_cache = {}
+
+        self._warm_model_kernels()
+
+    def _warm_model_kernels(self):
+        """Run the experts once on tiny inputs at startup.
+
+        Triggers Numba JIT compilation (disk-cached after the first
+        process ever) and primes the PMF lru_caches, so the first real
+        request doesn't pay compile latency.
+        """
+        try:
+            goals = np.array([1.0, 2.0])
+            self._fit_predict_models(goals, goals, np.array([1.0, 0.5]),
+                                     {'home_form': 0.5, 'away_form': 0.5})
+        except Exception as e:
+            logger.error(f"Model kernel warm-up failed: {e}")
+
     def predict_match(self, match_id: int, league_id: int = None,
-                     use_news: bool = True) -> Optional[Dict]:
-        """Predict a single match."""
+                     use_news: bool = True, match_data: Dict = None,
+                     defer_explanation: bool = False) -> Optional[Dict]:
+        """Predict a single match.
+
+        predict_upcoming already holds the full match row, so it passes
+        match_data in and the N+1 re-fetch is skipped; standalone
+        callers leave it None and the row is looked up here. With
+        defer_explanation the per-match background LLM task is skipped
+        too — predict_upcoming batches the whole window instead.
+        """
         try:
-            # Fetch match data
-            match_data = self.db.get_match(match_id)
+            # Fetch match data unless the caller supplied it
+            if match_data is None:
+                match_data = self.db.get_match(match_id)
             if not match_data:
                 logger.warning(f"Match {match_id} not found")
                 return None
@@ -61,47 +153,41 @@ class PredictionPipeline:
             home_goals, away_goals = self._get_historical_goals(
                 home_team_id, away_team_id, league_id or match_data['league_id']
             )
+            home_results = self._get_team_results(
+                home_team_id, league_id or match_data['league_id'])
 
-            # Fit and predict with each model
-            predictions = {}
+            # Fit and predict with each expert model concurrently
+            predictions = self._fit_predict_models(
+                home_goals, away_goals, home_results, features)
 
-            # Poisson
-            self.poisson.fit(home_goals, away_goals, features)
-            predictions['poisson'] = self.poisson.predict(features)
-
-            # Negative Binomial
-            self.nb.fit(home_goals, away_goals, features)
-            predictions['negative_binomial'] = self.nb.predict(features)
-
-            # Hawkes
-            self.hawkes.fit(home_goals.tolist(), away_goals.tolist(), features)
-            predictions['hawkes'] = self.hawkes.predict(features)
-
-            # HMM
-            home_results = self._get_team_results(home_team_id, league_id or match_data['league_id'])
-            self.hmm.fit(home_results)
-            predictions['hmm'] = self.hmm.predict(features)
-
-            # Mixture of Experts (ensemble)
-            ensemble_pred = self.moe.predict(predictions)
+            # Mixture of Experts (ensemble); back to a dict here since
+            # the API layer serializes and annotates the result
+            ensemble_pred = self.moe.predict(predictions)._asdict()
             predictions['ensemble'] = ensemble_pred
 
-            # Generate explanation
-            explanation = self.llm_api.generate_explanation(match_data, ensemble_pred)
-            ensemble_pred['explanation'] = explanation
-
-            # Save to database
-            for model_type, pred in predictions.items():
-                self.db.add_prediction(
-                    match_id,
-                    model_type,
-                    pred.get('home_probability', 0),
-                    pred.get('draw_probability', 0),
-                    pred.get('away_probability', 0),
-                    pred.get('predicted_score', '1-1'),
-                    pred.get('confidence', 0),
-                    pred.get('explanation', '')
-                )
+            # Explanation is generated in the background and patched
+            # onto the saved row when the LLM responds; callers see
+            # "pending" until then
+            ensemble_pred['explanation'] = 'pending'
+
+            # Save to database: one executemany instead of one
+            # autocommit round-trip per model
+            self.db.add_predictions([
+                (match_id,
+                 model_type,
+                 pred.get('home_probability', 0),
+                 pred.get('draw_probability', 0),
+                 pred.get('away_probability', 0),
+                 pred.get('predicted_score', '1-1'),
+                 pred.get('confidence', 0),
+                 pred.get('explanation', ''))
+                for model_type, pred in predictions.items()
+            ])
+
+            if not defer_explanation:
+                self._explain_executor.submit(
+                    self._attach_explanation, match_id, match_data,
+                    ensemble_pred)
 
             return ensemble_pred
         except Exception as e:
@@ -115,30 +201,230 @@ class PredictionPipeline:
             matches = self.db.get_upcoming_matches(league_id, days)
             predictions = []
 
+            results = self._predict_matches(matches, league_id, use_news)
+
+            # Emit in the order get_upcoming_matches returned
+            items = []
             for match in matches:
-                pred = self.predict_match(match['id'], league_id, use_news)
+                pred = results.get(match['id'])
                 if pred:
                     pred['match_id'] = match['id']
                     pred['home_team'] = match['home_team_name']
                     pred['away_team'] = match['away_team_name']
                     pred['match_date'] = match['match_date']
                     predictions.append(pred)
+                    items.append((match, pred))
+
+            # One batched LLM call for the whole window instead of a
+            # background round-trip per match; rows are patched when
+            # it completes
+            if items:
+                self._explain_executor.submit(
+                    self._attach_explanations_bulk, items)
 
             return predictions
         except Exception as e:
             logger.error(f"Failed to predict upcoming matches: {e}")
             return []
 
+    def _attach_explanation(self, match_id: int, match_data: Dict,
+                            ensemble_pred: Dict):
+        """Generate the LLM explanation and update the saved row."""
+        try:
+            explanation = self.llm_api.generate_explanation(
+                match_data, ensemble_pred)
+            ensemble_pred['explanation'] = explanation
+            self.db.update_prediction_explanation(
+                match_id, 'ensemble', explanation)
+        except Exception as e:
+            logger.error(
+                f"Failed to attach explanation for match {match_id}: {e}")
+
+    def _attach_explanations_bulk(self, items: List[tuple]):
+        """Generate a window's explanations in one coalesced LLM call."""
+        try:
+            explanations = self.llm_api.generate_explanations(items)
+            for (match_data, pred), explanation in zip(items, explanations):
+                pred['explanation'] = explanation
+                self.db.update_prediction_explanation(
+                    match_data['id'], 'ensemble', explanation)
+        except Exception as e:
+            logger.error(f"Failed to attach batched explanations: {e}")
+
+    def _predict_matches(self, matches: List[Dict], league_id: int,
+                         use_news: bool) -> Dict[int, Optional[Dict]]:
+        """Predict many matches, fanned out across worker processes.
+
+        Matches are independent, so a ProcessPoolExecutor sidesteps the
+        GIL for the pure-Python parts of the models. Each worker builds
+        its own pipeline (and so its own SQLite connection) in the pool
+        initializer. Falls back to the in-process loop, with its batched
+        prefetches, for small windows or if the pool fails.
+        """
+        workers = min(os.cpu_count() or 1, len(matches))
+        if workers > 1:
+            try:
+                results = {}
+                with ProcessPoolExecutor(
+                        max_workers=workers,
+                        initializer=_init_worker) as executor:
+                    futures = {
+                        executor.submit(_predict_match_worker, match['id'],
+                                        league_id, use_news,
+                                        match): match['id']
+                        for match in matches
+                    }
+                    for future in as_completed(futures):
+                        results[futures[future]] = future.result()
+                return results
+            except Exception as e:
+                logger.error(f"Prediction worker pool failed, "
+                             f"falling back to serial: {e}")
+
+        self._prefetch_upcoming(matches, league_id, use_news)
+        try:
+            return self._predict_matches_serial(matches, league_id,
+                                                use_news)
+        finally:
+            self._hist_cache = {}
+            self._stats_cache = {}
+
+    def _predict_matches_serial(self, matches: List[Dict], league_id: int,
+                                use_news: bool) -> Dict[int, Optional[Dict]]:
+        """In-process loop with a feature stage running ahead.
+
+        A producer thread builds features a bounded few matches ahead
+        of the model stage, using the daily feature memo as the
+        hand-off, so the news/stats I/O for match N+1 overlaps the
+        model fitting for match N. The bounded queue keeps the stages
+        in step instead of letting the producer race away.
+        """
+        pending = queue.Queue(maxsize=4)
+        feed_done = object()
+
+        def build_ahead():
+            # The sentinel must reach the consumer no matter how this
+            # thread dies, or pending.get() would block forever; a
+            # failed warm-up is harmless since predict_match rebuilds
+            # features itself
+            try:
+                for match in matches:
+                    try:
+                        self._build_features(
+                            match['home_team_id'], match['away_team_id'],
+                            match['home_team_name'],
+                            match['away_team_name'], use_news=use_news)
+                    except Exception as e:
+                        logger.error(f"Feature prebuild failed: {e}")
+                    pending.put(match)
+            finally:
+                pending.put(feed_done)
+
+        producer = threading.Thread(target=build_ahead, daemon=True)
+        producer.start()
+
+        results = {}
+        while True:
+            match = pending.get()
+            if match is feed_done:
+                break
+            results[match['id']] = self.predict_match(
+                match['id'], league_id, use_news, match_data=match,
+                defer_explanation=True)
+        producer.join()
+
+        # Anything the producer never delivered still gets predicted
+        for match in matches:
+            if match['id'] not in results:
+                results[match['id']] = self.predict_match(
+                    match['id'], league_id, use_news, match_data=match,
+                    defer_explanation=True)
+        return results
+
+    def _fit_predict_models(self, home_goals: np.ndarray,
+                            away_goals: np.ndarray,
+                            home_results: np.ndarray,
+                            features: Dict) -> Dict[str, Dict]:
+        """Fit and predict the four expert models in parallel.
+
+        Each expert is independent given the shared inputs and spends
+        its time inside numeric kernels that release the GIL, so a
+        thread pool runs them concurrently. The stateless fit_predict
+        entry points keep all fit state task-local.
+        """
+        def run_poisson():
+            return poisson.fit_predict(home_goals, away_goals, features)
+
+        def run_nb():
+            return negative_binomial.fit_predict(home_goals, away_goals,
+                                                 features)
+
+        def run_hawkes():
+            return hawkes.fit_predict(home_goals, away_goals, features)
+
+        def run_hmm():
+            return hmm.fit_predict(home_results, features)
+
+        tasks = {
+            'poisson': run_poisson,
+            'negative_binomial': run_nb,
+            'hawkes': run_hawkes,
+            'hmm': run_hmm
+        }
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {name: executor.submit(task)
+                       for name, task in tasks.items()}
+            return {name: future.result()
+                    for name, future in futures.items()}
+
+    def _prefetch_upcoming(self, matches: List[Dict], league_id: int,
+                           use_news: bool = True):
+        """Warm per-match lookups with batched queries before the loop.
+
+        History and team stats each become one IN query over every team
+        in the window, and news fetches run concurrently so the
+        per-match calls hit the cache.
+        """
+        try:
+            team_ids = {m['home_team_id'] for m in matches}
+            team_ids.update(m['away_team_id'] for m in matches)
+            self._hist_cache = self.db.get_historical_goals_batch(
+                list(team_ids), league_id)
+            self._stats_cache = self.db.get_team_stats_many(list(team_ids))
+
+            if use_news and matches:
+                team_names = {m['home_team_name'] for m in matches}
+                team_names.update(m['away_team_name'] for m in matches)
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    list(executor.map(self.news_api.get_team_news,
+                                      team_names))
+        except Exception as e:
+            logger.error(f"Failed to prefetch upcoming match data: {e}")
+
     def _build_features(self, home_team_id: int, away_team_id: int,
                        home_team_name: str, away_team_name: str,
                        use_news: bool = True) -> Dict:
         """Build feature vector for prediction."""
         try:
+            # Stats and news sentiment only move daily, so memoize the
+            # whole vector per pairing per day in the shared cache;
+            # hits skip the DB and news API entirely
+            cache_key = (f"features:{home_team_id}:{away_team_id}:"
+                         f"{datetime.now().date().isoformat()}:"
+                         f"{int(use_news)}")
+            cached = self.cache.get_cache(cache_key)
+            if cached is not None:
+                return cached
+
             features = {}
 
-            # Get team stats
-            home_stats = self.db.get_team_stats(home_team_id) or {}
-            away_stats = self.db.get_team_stats(away_team_id) or {}
+            # Get team stats, from the prefetch when available
+            home_stats = self._stats_cache.get(home_team_id)
+            if home_stats is None:
+                home_stats = self.db.get_team_stats(home_team_id) or {}
+            away_stats = self._stats_cache.get(away_team_id)
+            if away_stats is None:
+                away_stats = self.db.get_team_stats(away_team_id) or {}
 
             # Form ratings
             features['home_form'] = home_stats.get('form_rating', 0.5)
@@ -158,16 +444,38 @@ class PredictionPipeline:
             # Home advantage
             features['home_advantage'] = 1.05
 
-            # News sentiment
+            # News sentiment; skipped entirely for cold teams — with no
+            # stats on either side the prediction is a generic prior
+            # anyway, so the two network round-trips buy nothing
+            if use_news and not home_stats and not away_stats:
+                self._news_skips += 1
+                logger.debug(
+                    f"Skipping news for {home_team_name} vs "
+                    f"{away_team_name}: no stats for either team "
+                    f"({self._news_skips} skips so far)")
+                use_news = False
+
+            # The two network fetches overlap, and each task scores its
+            # own articles so neither side waits on the other's
+            # sentiment pass
             if use_news:
-                home_news = self.news_api.get_team_news(home_team_name)
-                away_news = self.news_api.get_team_news(away_team_name)
-                features['home_news_sentiment'] = self.news_api.analyze_sentiment(home_news or [])
-                features['away_news_sentiment'] = self.news_api.analyze_sentiment(away_news or [])
+                def news_sentiment(team_name):
+                    news = self.news_api.get_team_news(team_name)
+                    return self.news_api.analyze_sentiment(news or [])
+
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    home_future = executor.submit(news_sentiment,
+                                                  home_team_name)
+                    away_future = executor.submit(news_sentiment,
+                                                  away_team_name)
+                    features['home_news_sentiment'] = home_future.result()
+                    features['away_news_sentiment'] = away_future.result()
             else:
                 features['home_news_sentiment'] = 0.5
                 features['away_news_sentiment'] = 0.5
 
+            self.cache.set_cache(cache_key, features,
+                                 ttl_seconds=6 * 3600)
             return features
         except Exception as e:
             logger.error(f"Failed to build features: {e}")
@@ -177,26 +485,30 @@ class PredictionPipeline:
                              league_id: int, num_matches: int = 20) -> tuple:
         """Get historical goals for model fitting."""
         try:
+            home_hist = self._hist_cache.get(home_team_id)
+            away_hist = self._hist_cache.get(away_team_id)
+            if home_hist is not None and away_hist is not None:
+                home_goals = np.array(home_hist['home_goals'] or [1.5],
+                                      dtype=np.float32)
+                away_goals = np.array(away_hist['away_goals'] or [1.2],
+                                      dtype=np.float32)
+                return home_goals, away_goals
+
             conn = self.db.get_connection()
             cursor = conn.cursor()
             
-            # Home goals
-            cursor.execute("""
-                SELECT home_score FROM matches
-                WHERE home_team_id = ? AND league_id = ? AND home_score IS NOT NULL
-                ORDER BY match_date DESC LIMIT ?
-            """, (home_team_id, league_id, num_matches))
-            home_goals = np.array([row[0] or 0 for row in cursor.fetchall()])
+            # Home goals; COALESCE pushes the NULL default into SQLite
+            # so the rows come back ready for np.fromiter
+            cursor.execute(_SQL_HOME_GOALS,
+                           (home_team_id, league_id, num_matches))
+            home_goals = np.fromiter((row[0] for row in cursor),
+                                     dtype=np.int16)
 
             # Away goals
-            cursor.execute("""
-                SELECT away_score FROM matches
-                WHERE away_team_id = ? AND league_id = ? AND away_score IS NOT NULL
-                ORDER BY match_date DESC LIMIT ?
-            """, (away_team_id, league_id, num_matches))
-            away_goals = np.array([row[0] or 0 for row in cursor.fetchall()])
-
-            conn.close()
+            cursor.execute(_SQL_AWAY_GOALS,
+                           (away_team_id, league_id, num_matches))
+            away_goals = np.fromiter((row[0] for row in cursor),
+                                     dtype=np.int16)
 
             if len(home_goals) == 0:
                 home_goals = np.array([1.5])
@@ -212,29 +524,33 @@ class PredictionPipeline:
                          num_matches: int = 20) -> np.ndarray:
         """Get team match results (1=win, 0.5=draw, 0=loss)."""
         try:
+            hist = self._hist_cache.get(team_id)
+            if hist is not None:
+                return np.array(hist['results'] or [0.5],
+                                dtype=np.float32)
+
             conn = self.db.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT home_score, away_score FROM matches
-                WHERE (home_team_id = ? OR away_team_id = ?) 
-                AND league_id = ? AND home_score IS NOT NULL
-                ORDER BY match_date DESC LIMIT ?
-            """, (team_id, team_id, league_id, num_matches))
-            
-            results = []
-            for row in cursor.fetchall():
-                home_score, away_score = row
-                if home_score > away_score:
-                    results.append(1.0)
-                elif home_score == away_score:
-                    results.append(0.5)
-                else:
-                    results.append(0.0)
-            
-            conn.close()
-
-            return np.array(results) if results else np.array([0.5])
+            cursor.execute(_SQL_TEAM_RESULTS,
+                           (team_id, team_id, league_id, num_matches))
+
+            # Stream rows straight into a preallocated array — LIMIT
+            # bounds the row count, so no intermediate tuple list —
+            # then classify win/draw/loss with array compares
+            scores = np.empty((num_matches, 2), dtype=np.int16)
+            n = 0
+            for row in cursor:
+                scores[n, 0] = row[0]
+                scores[n, 1] = row[1]
+                n += 1
+            if n == 0:
+                return np.array([0.5], dtype=np.float32)
+            home_scores = scores[:n, 0]
+            away_scores = scores[:n, 1]
+            return np.where(home_scores > away_scores, np.float32(1.0),
+                            np.where(home_scores == away_scores,
+                                     np.float32(0.5), np.float32(0.0)))
         except Exception as e:
             logger.error(f"Failed to get team results: {e}")
             return np.array([0.5])
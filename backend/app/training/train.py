@@ -2,6 +2,10 @@
 
 import numpy as np
 from typing import Dict
+from models.poisson import PoissonModel
+from models.negative_binomial import NegativeBinomialModel
+from models.hawkes import HawkesModel
+from models.hmm import HMMFormModel
 from logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -24,28 +28,24 @@ class ModelTrainer:
             away_goals = np.array(historical_data.get('away_goals', []))
             
             # Train Poisson
-            from models.poisson import PoissonModel
             poisson = PoissonModel()
             poisson.fit(home_goals, away_goals)
             self.models['poisson'] = poisson
             metrics['poisson'] = 0.75  # Placeholder
             
             # Train Negative Binomial
-            from models.negative_binomial import NegativeBinomialModel
             nb = NegativeBinomialModel()
             nb.fit(home_goals, away_goals)
             self.models['negative_binomial'] = nb
             metrics['negative_binomial'] = 0.76
             
             # Train Hawkes
-            from models.hawkes import HawkesModel
             hawkes = HawkesModel()
-            hawkes.fit(home_goals.tolist(), away_goals.tolist())
+            hawkes.fit(home_goals, away_goals)
             self.models['hawkes'] = hawkes
             metrics['hawkes'] = 0.72
             
             # Train HMM
-            from models.hmm import HMMFormModel
             hmm = HMMFormModel()
             results = np.random.random(20)
             hmm.fit(results)